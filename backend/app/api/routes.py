@@ -4,7 +4,14 @@ Handles company authenticity check requests and queries.
 """
 
 import logging
-from fastapi import APIRouter, HTTPException, Query
+from typing import Callable, Coroutine
+
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, Response
+from fastapi.routing import APIRoute
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from app.models.company import CheckCompanyRequest, CheckCompanyResponse, CompanyInsight
 from app.services.company_aggregator import (
     build_company_insight,
@@ -14,7 +21,58 @@ from app.services.company_aggregator import (
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api", tags=["company"])
+
+async def company_error_handler(request: Request, exc: Exception) -> ORJSONResponse:
+    """
+    Convert unhandled route errors into a failed CheckCompanyResponse.
+    
+    Called by CompanyErrorRoute so route handlers stay free of try/except.
+    ValueErrors are reported as validation errors, anything else as a server error.
+    
+    Args:
+        request: Incoming request that raised
+        exc: The unhandled exception
+        
+    Returns:
+        ORJSONResponse with success=False and the error message (HTTP 200)
+    """
+    if isinstance(exc, ValueError):
+        logger.error(f"Validation error on {request.url.path}: {exc}")
+        error = f"Validation error: {str(exc)}"
+    else:
+        logger.error(f"Error handling {request.method} {request.url.path}: {exc}")
+        error = f"Server error: {str(exc)}"
+    
+    return ORJSONResponse(
+        CheckCompanyResponse(success=False, error=error).model_dump(mode="json"),
+        status_code=200
+    )
+
+
+class CompanyErrorRoute(APIRoute):
+    """
+    APIRoute that turns unhandled handler errors into failed CheckCompanyResponses.
+    
+    Errors are converted inside the route rather than by an app-level handler,
+    so the response still passes back through the CORS and GZip middleware.
+    HTTP and request validation errors keep FastAPI's default handling.
+    """
+    
+    def get_route_handler(self) -> Callable[[Request], Coroutine[None, None, Response]]:
+        handler = super().get_route_handler()
+        
+        async def handle_errors(request: Request) -> Response:
+            try:
+                return await handler(request)
+            except (StarletteHTTPException, RequestValidationError):
+                raise
+            except Exception as exc:
+                return await company_error_handler(request, exc)
+        
+        return handle_errors
+
+
+router = APIRouter(prefix="/api", tags=["company"], route_class=CompanyErrorRoute)
 
 
 @router.post("/check-company", response_model=CheckCompanyResponse)
@@ -43,30 +101,17 @@ async def check_company(request: CheckCompanyRequest) -> CheckCompanyResponse:
             "category": "training"
         }
     """
-    try:
-        logger.info(f"Checking company: {request.name}")
-        
-        # Build complete insight
-        insight = await build_company_insight(request)
-        
-        return CheckCompanyResponse(
-            success=True,
-            data=insight,
-            message="Company analysis completed successfully"
-        )
-        
-    except ValueError as e:
-        logger.error(f"Validation error: {e}")
-        return CheckCompanyResponse(
-            success=False,
-            error=f"Validation error: {str(e)}"
-        )
-    except Exception as e:
-        logger.error(f"Error checking company {request.name}: {e}")
-        return CheckCompanyResponse(
-            success=False,
-            error=f"Server error: {str(e)}"
-        )
+    canonical_name = normalize_canonical_name(request.name)
+    logger.info(f"Checking company: {request.name} (canonical: {canonical_name})")
+    
+    # Build complete insight
+    insight = await build_company_insight(request, canonical_name=canonical_name)
+    
+    return CheckCompanyResponse(
+        success=True,
+        data=insight,
+        message="Company analysis completed successfully"
+    )
 
 
 @router.get("/company/{canonical_name}", response_model=CheckCompanyResponse)
@@ -83,30 +128,22 @@ async def get_company(canonical_name: str) -> CheckCompanyResponse:
     Example:
         GET /api/company/xyz-training-academy
     """
-    try:
-        from app.services.repository import get_db_service
-        
-        db_service = get_db_service()
-        insight = await db_service.get_company_by_canonical_name(canonical_name)
-        
-        if not insight:
-            return CheckCompanyResponse(
-                success=False,
-                error=f"Company '{canonical_name}' not found"
-            )
-        
-        return CheckCompanyResponse(
-            success=True,
-            data=insight,
-            message="Company data retrieved successfully"
-        )
-        
-    except Exception as e:
-        logger.error(f"Error retrieving company {canonical_name}: {e}")
+    from app.services.repository import get_db_service
+    
+    db_service = get_db_service()
+    insight = await db_service.get_company_by_canonical_name(canonical_name)
+    
+    if not insight:
         return CheckCompanyResponse(
             success=False,
-            error=f"Server error: {str(e)}"
+            error=f"Company '{canonical_name}' not found"
         )
+    
+    return CheckCompanyResponse(
+        success=True,
+        data=insight,
+        message="Company data retrieved successfully"
+    )
 
 
 @router.post("/company/{canonical_name}/refresh", response_model=CheckCompanyResponse)
@@ -125,40 +162,36 @@ async def refresh_company(canonical_name: str) -> CheckCompanyResponse:
     Example:
         POST /api/company/xyz-training-academy/refresh
     """
-    try:
-        logger.info(f"Refreshing company: {canonical_name}")
-        
-        insight = await refresh_company_insight(canonical_name)
-        
-        if not insight:
-            return CheckCompanyResponse(
-                success=False,
-                error=f"Company '{canonical_name}' not found"
-            )
-        
-        return CheckCompanyResponse(
-            success=True,
-            data=insight,
-            message="Company data refreshed successfully"
-        )
-        
-    except Exception as e:
-        logger.error(f"Error refreshing company {canonical_name}: {e}")
+    logger.info(f"Refreshing company: {canonical_name}")
+    
+    insight = await refresh_company_insight(canonical_name)
+    
+    if not insight:
         return CheckCompanyResponse(
             success=False,
-            error=f"Server error: {str(e)}"
+            error=f"Company '{canonical_name}' not found"
         )
+    
+    return CheckCompanyResponse(
+        success=True,
+        data=insight,
+        message="Company data refreshed successfully"
+    )
+
+
+# Health status is static, so its body is serialized once
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": "Know Your Company - Company Authenticity Checker"
+})
 
 
 @router.get("/health")
-async def health_check() -> dict:
+async def health_check() -> Response:
     """
     Health check endpoint for monitoring.
     
     Returns:
-        Status dict
+        Prebuilt JSON status response
     """
-    return {
-        "status": "healthy",
-        "service": "Know Your Company - Company Authenticity Checker"
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
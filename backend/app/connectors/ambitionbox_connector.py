@@ -1,38 +1,71 @@
 """
 AmbitionBox data connector.
-Scrapes AmbitionBox company data using BeautifulSoup.
+Scrapes AmbitionBox company data using selectolax (lexbor backend).
 
 Approach:
-1) Fetch search page and locate first reviews link (e.g. /reviews/<slug>-reviews)
-2) Fetch reviews page and parse rating/review_count via JSON-LD or text fallback
-3) Emit SourceSignal with platform="ambitionbox", rating, review_count
+1) Speculatively fetch the reviews page for a slug guessed from the company name,
+   concurrently with the search page
+2) If the guess misses, locate the first reviews link on the search page
+   (e.g. /reviews/<slug>-reviews) and fetch it
+3) Parse rating/review_count via JSON-LD or text fallback
+4) Emit SourceSignal with platform="ambitionbox", rating, review_count
 """
 
+import asyncio
 import logging
 import re
-import json
+import orjson
 from typing import Optional, Tuple
 import httpx
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 
 from app.models.company import SourceSignal
+from app.core.async_cache import async_ttl_cache
 from app.core.config import settings
+from app.core.http import get_with_retry, stream_with_retry
 
 logger = logging.getLogger(__name__)
 
-DESKTOP_USER_AGENT = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) "
-    "Chrome/91.0.4472.124 Safari/537.36"
+AMBITIONBOX_BASE = "https://www.ambitionbox.com"
+
+# Caps in-flight requests to AmbitionBox across all lookups
+_AMBITIONBOX_SEM = asyncio.Semaphore(settings.PER_HOST_CONCURRENCY)
+
+# Reviews page links on the search results page, matched on raw bytes
+_REVIEWS_HREF_RE = re.compile(rb'href=["\'](/reviews/[^"\']+-reviews)["\']')
+
+# Bytes re-scanned from the previous chunk so a link split across chunks still matches
+_HREF_SCAN_OVERLAP = 1024
+
+# JSON-LD script bodies; script contents are raw text, so no DOM is needed
+_JSONLD_SCRIPT_RE = re.compile(
+    rb'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.DOTALL | re.IGNORECASE,
 )
 
-AMBITIONBOX_BASE = "https://www.ambitionbox.com"
+# Text fallback patterns for the reviews page
+_RATING_RE = re.compile(r"(\d\.\d)\b")
+_REVIEWS_COUNT_RE = re.compile(r"([\d,]+)\s+reviews")
 
+# Characters dropped when slugging a company name
+_SLUG_STRIP_RE = re.compile(r"[^a-z0-9\s-]")
 
+# Company name -> search query substitutions, applied in a single pass
+_SEARCH_QUERY_TRANS = str.maketrans({" ": "+", "\t": "+", "\n": "", "\r": ""})
+
+
+@async_ttl_cache(
+    maxsize=settings.CONNECTOR_CACHE_MAXSIZE,
+    ttl=settings.CONNECTOR_CACHE_TTL_SECONDS,
+    key=lambda company_name: " ".join(company_name.lower().split()),
+)
 async def fetch_ambitionbox_signals(company_name: str) -> list[SourceSignal]:
     """
     Fetch signals from AmbitionBox for a company.
     
+    Results are cached in-process per normalized company name; call
+    ``fetch_ambitionbox_signals.__wrapped__`` to bypass the cache.
+    
     Args:
         company_name: Name of the company to search
         
@@ -44,29 +77,32 @@ async def fetch_ambitionbox_signals(company_name: str) -> list[SourceSignal]:
     try:
         logger.info(f"Fetching AmbitionBox signals for: {company_name}")
 
-        search_q = company_name.replace(" ", "+")
+        search_q = company_name.translate(_SEARCH_QUERY_TRANS)
         search_url = f"{AMBITIONBOX_BASE}/search?q={search_q}"
 
-        async with httpx.AsyncClient(timeout=settings.HTTP_TIMEOUT_SECONDS, follow_redirects=True) as client:
-            response = await client.get(
-                search_url,
-                headers={"User-Agent": DESKTOP_USER_AGENT, "Accept": "text/html"}
-            )
-            response.raise_for_status()
+        guessed_url = _guess_reviews_url(company_name)
+        search_task = asyncio.create_task(_search_reviews_link(search_url))
+        try:
+            parsed = await _fetch_guessed_reviews(guessed_url)
+            if parsed is not None:
+                reviews_url = guessed_url
+            else:
+                reviews_url = await search_task
+                if not reviews_url:
+                    logger.debug("No AmbitionBox reviews link found on search page")
+                    return signals
 
-        reviews_url = _find_reviews_link(response.text)
-        if not reviews_url:
-            logger.debug("No AmbitionBox reviews link found on search page")
-            return signals
-
-        async with httpx.AsyncClient(timeout=settings.HTTP_TIMEOUT_SECONDS, follow_redirects=True) as client:
-            reviews_resp = await client.get(
-                reviews_url,
-                headers={"User-Agent": DESKTOP_USER_AGENT, "Accept": "text/html"}
-            )
-            reviews_resp.raise_for_status()
+                reviews_resp = await _get(reviews_url)
+                reviews_resp.raise_for_status()
+                parsed = _parse_reviews_page(reviews_resp.content)
+        finally:
+            if not search_task.done():
+                search_task.cancel()
+            elif not search_task.cancelled():
+                # Retrieve an unused search failure so asyncio doesn't log it as unretrieved
+                search_task.exception()
 
-        rating, review_count, display_name = _parse_reviews_page(reviews_resp.text)
+        rating, review_count, display_name = parsed
 
         if rating is None and review_count is None:
             logger.debug("AmbitionBox page parsed but no rating/reviews extracted")
@@ -97,103 +133,154 @@ async def fetch_ambitionbox_signals(company_name: str) -> list[SourceSignal]:
     return signals
 
 
-def _find_reviews_link(html: str) -> Optional[str]:
-    """Find the first reviews page link from the search HTML."""
+async def _get(url: str) -> httpx.Response:
+    """GET an AmbitionBox page, bounded by the per-host concurrency limit."""
+    async with _AMBITIONBOX_SEM:
+        return await get_with_retry(url, headers={"Accept": "text/html"})
+
+
+async def _search_reviews_link(search_url: str) -> Optional[str]:
+    """
+    Stream the search page and stop reading as soon as a reviews link appears.
+    
+    The link is usually near the top of the results, so most of the body is
+    never downloaded or decoded.
+    """
+    async with _AMBITIONBOX_SEM:
+        async with stream_with_retry(search_url, headers={"Accept": "text/html"}) as response:
+            response.raise_for_status()
+            buffer = bytearray()
+            async for chunk in response.aiter_bytes():
+                scan_from = max(0, len(buffer) - _HREF_SCAN_OVERLAP)
+                buffer += chunk
+                reviews_url = _find_reviews_link(buffer, scan_from)
+                if reviews_url:
+                    return reviews_url
+    return None
+
+
+def _guess_reviews_url(company_name: str) -> str:
+    """Build the likely reviews page URL by slugging the company name."""
+    slug = "-".join(_SLUG_STRIP_RE.sub("", company_name.lower()).split())
+    return f"{AMBITIONBOX_BASE}/reviews/{slug}-reviews"
+
+
+async def _fetch_guessed_reviews(
+    reviews_url: str,
+) -> Optional[Tuple[Optional[float], Optional[int], Optional[str]]]:
+    """Fetch and parse a guessed reviews page; None if it is missing or yields no data."""
     try:
-        soup = BeautifulSoup(html, "html.parser")
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
-            if re.match(r"^/reviews/.+-reviews$", href):
-                return f"{AMBITIONBOX_BASE}{href}"
+        response = await _get(reviews_url)
+        if response.status_code != 200:
+            logger.debug(f"Guessed AmbitionBox URL {reviews_url} returned {response.status_code}")
+            return None
+    except httpx.RequestError as e:
+        logger.debug(f"Guessed AmbitionBox request failed for {reviews_url}: {e}")
         return None
-    except Exception:
+
+    rating, review_count, display_name = _parse_reviews_page(response.content)
+    if rating is None and review_count is None:
+        return None
+    return rating, review_count, display_name
+
+
+def _find_reviews_link(html: bytes, pos: int = 0) -> Optional[str]:
+    """Find the first reviews page link in the raw search HTML bytes, starting at `pos`."""
+    m = _REVIEWS_HREF_RE.search(html, pos)
+    if not m:
         return None
+    return AMBITIONBOX_BASE + m.group(1).decode("utf-8", errors="ignore")
 
 
-def _parse_reviews_page(html: str) -> Tuple[Optional[float], Optional[int], Optional[str]]:
-    """Extract rating, review_count, and display name from reviews page HTML."""
+def _parse_reviews_page(html: bytes) -> Tuple[Optional[float], Optional[int], Optional[str]]:
+    """
+    Extract rating, review_count, and display name from raw reviews page HTML bytes.
+    
+    JSON-LD is read without building a DOM; the lexbor tree is only built
+    when JSON-LD yields neither a rating nor a review count.
+    """
     # 1) JSON-LD aggregateRating
     rating, reviews, name = _extract_from_jsonld(html)
     if rating is not None or reviews is not None:
         return rating, reviews, name
 
-    # 2) Fallback patterns in text
+    # 2) Fallback patterns in text (only path that parses the full page)
     try:
-        soup = BeautifulSoup(html, "html.parser")
+        tree = LexborHTMLParser(html)
         if not name:
-            h1 = soup.find("h1")
-            title = soup.find("title")
-            name_text = h1.get_text(strip=True) if h1 else (title.get_text(strip=True) if title else None)
+            h1 = tree.css_first("h1")
+            title = tree.css_first("title")
+            name_text = h1.text(strip=True) if h1 else (title.text(strip=True) if title else None)
             if name_text and " - " in name_text:
                 name = name_text.split(" - ")[0].strip()
 
+        # Single pass for both values; ratings are only read from div/span
         rating_val = None
-        for elem in soup.find_all(["div", "span"], string=True):
-            text = elem.get_text(strip=True).lower()
-            if "rating" in text:
-                m = re.search(r"(\d\.\d)\b", text)
+        reviews_val = None
+        for elem in tree.css("div, span, p"):
+            text = elem.text(deep=False, strip=True).lower()
+            if rating_val is None and elem.tag != "p" and "rating" in text:
+                m = _RATING_RE.search(text)
                 if m:
                     try:
                         rating_val = float(m.group(1))
-                        break
                     except ValueError:
                         pass
-
-        reviews_val = None
-        for elem in soup.find_all(["div", "span", "p"], string=True):
-            text = elem.get_text(strip=True).lower()
-            m = re.search(r"([\d,]+)\s+reviews", text)
-            if m:
-                try:
-                    reviews_val = int(m.group(1).replace(",", ""))
-                    break
-                except ValueError:
-                    pass
+            if reviews_val is None:
+                m = _REVIEWS_COUNT_RE.search(text)
+                if m:
+                    try:
+                        reviews_val = int(m.group(1).replace(",", ""))
+                    except ValueError:
+                        pass
+            if rating_val is not None and reviews_val is not None:
+                break
 
         return rating_val, reviews_val, name
     except Exception:
         return None, None, name
 
 
-def _extract_from_jsonld(html: str) -> Tuple[Optional[float], Optional[int], Optional[str]]:
+def _extract_from_jsonld(html: bytes) -> Tuple[Optional[float], Optional[int], Optional[str]]:
     """Parse JSON-LD looking for aggregateRating and name."""
     try:
-        soup = BeautifulSoup(html, "html.parser")
-        for script in soup.find_all("script", type="application/ld+json"):
+        for script_content in _JSONLD_SCRIPT_RE.findall(html):
             try:
-                data = json.loads(script.string or "{}")
-            except json.JSONDecodeError:
+                data = orjson.loads(script_content or b"{}")
+            except orjson.JSONDecodeError:
                 continue
 
-            def extract(obj: dict) -> Tuple[Optional[float], Optional[int], Optional[str]]:
-                name = obj.get("name")
-                agg = obj.get("aggregateRating")
-                rating = None
-                reviews = None
-                if isinstance(agg, dict):
-                    rv = agg.get("ratingValue")
-                    rc = agg.get("reviewCount") or agg.get("ratingCount")
-                    try:
-                        rating = float(rv) if rv is not None else None
-                    except (TypeError, ValueError):
-                        rating = None
-                    try:
-                        reviews = int(rc) if rc is not None else None
-                    except (TypeError, ValueError):
-                        reviews = None
-                return rating, reviews, name
-
             if isinstance(data, dict):
-                r, c, n = extract(data)
+                r, c, n = _extract_jsonld_fields(data)
                 if r is not None or c is not None:
                     return r, c, n
             elif isinstance(data, list):
                 for item in data:
                     if not isinstance(item, dict):
                         continue
-                    r, c, n = extract(item)
+                    r, c, n = _extract_jsonld_fields(item)
                     if r is not None or c is not None:
                         return r, c, n
         return None, None, None
     except Exception:
         return None, None, None
+
+
+def _extract_jsonld_fields(obj: dict) -> Tuple[Optional[float], Optional[int], Optional[str]]:
+    """Read rating, review count, and name from a single JSON-LD object."""
+    name = obj.get("name")
+    agg = obj.get("aggregateRating")
+    rating = None
+    reviews = None
+    if isinstance(agg, dict):
+        rv = agg.get("ratingValue")
+        rc = agg.get("reviewCount") or agg.get("ratingCount")
+        try:
+            rating = float(rv) if rv is not None else None
+        except (TypeError, ValueError):
+            rating = None
+        try:
+            reviews = int(rc) if rc is not None else None
+        except (TypeError, ValueError):
+            reviews = None
+    return rating, reviews, name
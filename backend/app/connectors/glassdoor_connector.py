@@ -4,27 +4,26 @@ Scrapes Glassdoor employer data using Apollo state extraction from HTML.
 Includes mock data fallback for testing.
 """
 
+import asyncio
+import functools
 import logging
-import json
+import orjson
 import re
+import sys
+from types import MappingProxyType
 from typing import Optional
 import httpx
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 
 from app.models.company import SourceSignal
+from app.core.async_cache import async_ttl_cache
 from app.core.config import settings
+from app.core.http import stream_with_retry
 
 logger = logging.getLogger(__name__)
 
-# Desktop User-Agent to avoid blocking
-DESKTOP_USER_AGENT = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) "
-    "Chrome/91.0.4472.124 Safari/537.36"
-)
-
 # Company name to Glassdoor ID mapping
-COMPANY_ID_MAP = {
+_COMPANY_IDS = {
     "infosys": 7927,
     "tcs": 1353,
     "tata consultancy services": 1353,
@@ -41,10 +40,63 @@ COMPANY_ID_MAP = {
     "deloitte": 2347,
 }
 
+# Read-only view with interned keys so lookups of interned names compare by identity
+COMPANY_ID_MAP = MappingProxyType({sys.intern(name): cid for name, cid in _COMPANY_IDS.items()})
+
+# Punctuation dropped from company names before the ID lookup, in one pass
+_NAME_STRIP_TRANS = str.maketrans("", "", ".,")
+
+# Caps in-flight requests to Glassdoor across all lookups
+_GLASSDOOR_SEM = asyncio.Semaphore(settings.PER_HOST_CONCURRENCY)
+
+# Upper bound on a decompressed overview page; legitimate pages stay well below it
+_MAX_PAGE_BYTES = 5_000_000
 
+# Either Apollo cache assignment, found in a single pass over the page
+_APOLLO_ASSIGN_RE = re.compile(rb'window\.(__APOLLO_STATE__|apolloCache)\s*=\s*(?=\{)')
+
+# Structural characters the brace scanner needs to look at
+_JSON_TOKEN_RE = re.compile(rb'[{}"\\]')
+
+# Inline application/json script bodies that may hold the Apollo cache
+_JSON_SCRIPT_RE = re.compile(
+    rb'<script[^>]*type=["\']application/json["\'][^>]*>(.*?)</script>',
+    re.DOTALL | re.IGNORECASE,
+)
+
+# HTML fallback patterns; rating selectors are tried in priority order
+_RATING_SELECTORS = (
+    '[data-test="employer-rating"]',
+    'span[class*="rating" i]',
+    '[class*="rating" i]',
+)
+_REVIEW_COUNT_RE = re.compile(r'([\d,]+)\s*reviews?', re.I)
+_RAW_REVIEW_COUNT_RE = re.compile(rb'(\d[\d,]*)\s*reviews?', re.I)
 
+# Apollo employer field aliases, in priority order
+_RATING_KEYS = ("overallRating", "overall_rating", "rating")
+_REVIEW_KEYS = ("reviewCount", "review_count", "numReviews")
+_NAME_KEYS = ("name", "companyName")
 
-async def fetch_glassdoor_signals(company_name: str, company_id: Optional[int] = None) -> list[SourceSignal]:
+# JSON-LD script bodies, read without building a DOM
+_JSONLD_SCRIPT_RE = re.compile(
+    rb'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.DOTALL | re.IGNORECASE,
+)
+_JSONLD_MARKERS = (b'"ratingValue"', b'"reviewCount"', b'"numberOfReviews"', b'"name"')
+
+
+@functools.lru_cache(maxsize=1024)
+def _normalize_company_name(company_name: str) -> str:
+    """Normalize a company name for COMPANY_ID_MAP lookups."""
+    return sys.intern(" ".join(company_name.lower().translate(_NAME_STRIP_TRANS).split()))
+
+
+async def fetch_glassdoor_signals(
+    company_name: str,
+    company_id: Optional[int] = None,
+    force_refresh: bool = False
+) -> list[SourceSignal]:
     """
     Fetch signals from Glassdoor for a company.
     
@@ -54,6 +106,7 @@ async def fetch_glassdoor_signals(company_name: str, company_id: Optional[int] =
     Args:
         company_name: Company name (used for mapping if company_id not provided)
         company_id: Optional Glassdoor company ID
+        force_refresh: Bypass the per-company-ID overview cache
         
     Returns:
         List of SourceSignal objects from Glassdoor
@@ -62,7 +115,7 @@ async def fetch_glassdoor_signals(company_name: str, company_id: Optional[int] =
     
     # Try to get company ID from mapping if not provided
     if not company_id:
-        company_id = COMPANY_ID_MAP.get(company_name.lower().strip())
+        company_id = COMPANY_ID_MAP.get(_normalize_company_name(company_name))
     
     if not company_id:
         logger.debug(f"No Glassdoor ID mapping found for: {company_name}")
@@ -72,7 +125,8 @@ async def fetch_glassdoor_signals(company_name: str, company_id: Optional[int] =
         logger.info(f"Fetching Glassdoor signals for: {company_name} (ID: {company_id})")
         
         # Try to scrape real data from Glassdoor
-        overview_data = await scrape_glassdoor_overview(company_id)
+        scrape = scrape_glassdoor_overview.__wrapped__ if force_refresh else scrape_glassdoor_overview
+        overview_data = await scrape(company_id)
         
         if overview_data:
             # Create a single signal for the Glassdoor overview
@@ -95,10 +149,20 @@ async def fetch_glassdoor_signals(company_name: str, company_id: Optional[int] =
     return signals
 
 
+@async_ttl_cache(
+    maxsize=settings.CONNECTOR_CACHE_MAXSIZE,
+    ttl=settings.CONNECTOR_CACHE_TTL_SECONDS,
+    key=lambda company_id: company_id,
+)
 async def scrape_glassdoor_overview(company_id: int) -> Optional[dict]:
     """
     Scrape Glassdoor company overview page and extract data from Apollo state.
     
+    Results are cached in-process per company ID, so aliases mapping to the
+    same ID share one scrape; call ``scrape_glassdoor_overview.__wrapped__``
+    to bypass the cache. Concurrent calls for the same ID are coalesced into
+    one scrape by the cache decorator.
+    
     Args:
         company_id: Glassdoor company ID
         
@@ -108,36 +172,29 @@ async def scrape_glassdoor_overview(company_id: int) -> Optional[dict]:
     try:
         url = f"https://www.glassdoor.com/Overview/Working-at-EI_IE{company_id}.htm"
         
-        async with httpx.AsyncClient(timeout=settings.HTTP_TIMEOUT_SECONDS, follow_redirects=True) as client:
-            response = await client.get(
+        async with _GLASSDOOR_SEM:
+            async with stream_with_retry(
                 url,
                 headers={
-                    "User-Agent": DESKTOP_USER_AGENT,
                     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
                     "Accept-Language": "en-US,en;q=0.5",
+                    "Accept-Encoding": "gzip, br",
                     "Referer": "https://www.glassdoor.com/",
                 }
-            )
-            response.raise_for_status()
-        
-        html = response.text
-        
-        # Try to extract from Apollo state first
-        apollo_state = extract_apollo_state(html)
-        if apollo_state:
-            employer_data = parse_employer_from_apollo(apollo_state)
-            if employer_data:
-                logger.info(f"Successfully scraped real data for company ID {company_id}")
-                return employer_data
+            ) as response:
+                response.raise_for_status()
+                
+                # Raw bytes: regex scans and orjson work on them directly, and the HTML
+                # parser sniffs the charset itself, so the body is never decoded as a whole
+                buffer = bytearray()
+                async for chunk in response.aiter_bytes(65536):
+                    buffer += chunk
+                    if len(buffer) > _MAX_PAGE_BYTES:
+                        raise RuntimeError(f"response too large (over {_MAX_PAGE_BYTES} bytes)")
+        html = bytes(buffer)
         
-        # Fallback: Parse HTML structure directly
-        data = scrape_html_structure(html, company_id)
-        if data:
-            logger.info(f"Successfully scraped real data from HTML for company ID {company_id}")
-            return data
-        
-        logger.warning(f"Could not extract data from Glassdoor for company ID {company_id}")
-        return None
+        # Parsing is CPU-bound; run it off the event loop so other connectors progress
+        return await asyncio.to_thread(_parse_html_sync, html, company_id)
         
     except httpx.RequestError as e:
         logger.error(f"Glassdoor request failed for company ID {company_id}: {e}")
@@ -147,7 +204,38 @@ async def scrape_glassdoor_overview(company_id: int) -> Optional[dict]:
         return None
 
 
-def extract_apollo_state(html: str) -> Optional[dict]:
+def _parse_html_sync(html: bytes, company_id: int) -> Optional[dict]:
+    """
+    Extract overview data from a fetched Glassdoor page.
+    
+    Tries the embedded Apollo state first, then falls back to the HTML structure.
+    
+    Args:
+        html: Raw HTML bytes of Glassdoor page
+        company_id: Glassdoor company ID
+        
+    Returns:
+        Dict with extracted overview data or None
+    """
+    # Try to extract from Apollo state first
+    apollo_state = extract_apollo_state(html)
+    if apollo_state:
+        employer_data = parse_employer_from_apollo(apollo_state)
+        if employer_data:
+            logger.info(f"Successfully scraped real data for company ID {company_id}")
+            return employer_data
+    
+    # Fallback: Parse HTML structure directly
+    data = scrape_html_structure(html, company_id)
+    if data:
+        logger.info(f"Successfully scraped real data from HTML for company ID {company_id}")
+        return data
+    
+    logger.warning(f"Could not extract data from Glassdoor for company ID {company_id}")
+    return None
+
+
+def extract_apollo_state(html: bytes) -> Optional[dict]:
     """
     Extract Apollo state JSON from Glassdoor HTML page.
     
@@ -155,50 +243,45 @@ def extract_apollo_state(html: str) -> Optional[dict]:
     Tries multiple patterns to find the state object.
     
     Args:
-        html: HTML content of Glassdoor page
+        html: Raw HTML bytes of Glassdoor page
         
     Returns:
         Parsed Apollo state dict or None on failure
     """
     try:
-        # Pattern 1: __APOLLO_STATE__ in script tag
-        pattern1 = r'window\.__APOLLO_STATE__\s*=\s*(\{.*?\});?\s*(?:</script>|window\.)'
-        match = re.search(pattern1, html, re.DOTALL)
-        if match:
-            try:
-                state_json = match.group(1)
-                apollo_state = json.loads(state_json)
-                logger.debug("Successfully extracted Apollo state (pattern 1)")
-                return apollo_state
-            except json.JSONDecodeError:
-                logger.debug("Pattern 1 matched but JSON decode failed")
+        # Cheap substring prefilters so the regexes only run when they can match
+        has_apollo = b"__APOLLO_STATE__" in html or b"apolloCache" in html
+        has_json_scripts = b"application/json" in html
         
-        # Pattern 2: apolloCache in script tag
-        pattern2 = r'window\.apolloCache\s*=\s*(\{.*?\});?\s*(?:</script>|window\.)'
-        match = re.search(pattern2, html, re.DOTALL)
-        if match:
+        # Patterns 1 & 2: window.__APOLLO_STATE__ / window.apolloCache in script tag,
+        # both located by one scan; later assignments are tried if one fails to decode
+        for match in (_APOLLO_ASSIGN_RE.finditer(html) if has_apollo else ()):
+            marker = match.group(1).decode()
+            # A literal </script> cannot occur inside the script, so it bounds the scan
+            script_end = html.find(b"</script>", match.end())
+            state_json = _scan_json_object(html, match.end(), script_end if script_end != -1 else len(html))
+            if not state_json:
+                continue
             try:
-                state_json = match.group(1)
-                apollo_state = json.loads(state_json)
-                logger.debug("Successfully extracted Apollo state (pattern 2)")
+                apollo_state = orjson.loads(state_json)
+                logger.debug(f"Successfully extracted Apollo state ({marker})")
                 return apollo_state
-            except json.JSONDecodeError:
-                logger.debug("Pattern 2 matched but JSON decode failed")
+            except orjson.JSONDecodeError:
+                logger.debug(f"{marker} matched but JSON decode failed")
         
         # Pattern 3: Look in all script tags for JSON-like structures
-        script_pattern = r'<script[^>]*type=["\']application/json["\'][^>]*>(.*?)</script>'
-        scripts = re.findall(script_pattern, html, re.DOTALL | re.IGNORECASE)
+        scripts = _JSON_SCRIPT_RE.findall(html) if has_json_scripts else []
         
         for script_content in scripts:
             try:
-                data = json.loads(script_content)
+                data = orjson.loads(script_content)
                 if isinstance(data, dict) and any(
                     key.startswith('Employer') or key.startswith('employer') 
                     for key in data.keys()
                 ):
                     logger.debug("Successfully extracted Apollo state from JSON script tag")
                     return data
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 continue
         
         logger.debug("Apollo state not found in HTML")
@@ -209,6 +292,58 @@ def extract_apollo_state(html: str) -> Optional[dict]:
         return None
 
 
+def _scan_json_object(html: bytes, start: int, end: int) -> Optional[bytes]:
+    """
+    Return the object literal whose opening brace is at ``html[start]``.
+    
+    Walks forward once from the opening brace, tracking nesting depth and
+    string literals, so nested objects and braces inside strings are handled
+    without regex backtracking. The scan never looks past ``end`` (the
+    enclosing ``</script>``), so a truncated object costs one script's worth
+    of work rather than the rest of the page.
+    
+    Args:
+        html: Raw HTML bytes to scan
+        start: Index of the opening ``{``
+        end: Index the scan must not cross
+        
+    Returns:
+        The exact ``{...}`` byte slice, or None if unbalanced within bounds
+    """
+    depth = 0
+    in_string = False
+    pos = start
+    while True:
+        match = _JSON_TOKEN_RE.search(html, pos, end)
+        if not match:
+            return None
+        ch = match.group()
+        pos = match.end()
+        
+        if in_string:
+            if ch == b"\\":
+                pos += 1  # Skip the escaped character
+            elif ch == b'"':
+                in_string = False
+        elif ch == b'"':
+            in_string = True
+        elif ch == b"{":
+            depth += 1
+        elif ch == b"}":
+            depth -= 1
+            if depth == 0:
+                return html[start:pos]
+
+
+def _first(d: dict, keys: tuple[str, ...]):
+    """Return the value of the first key in ``keys`` that is set in ``d``, or None."""
+    for k in keys:
+        v = d.get(k)
+        if v is not None:
+            return v
+    return None
+
+
 def parse_employer_from_apollo(apollo_state: dict) -> Optional[dict]:
     """
     Parse employer information from Apollo state.
@@ -226,24 +361,26 @@ def parse_employer_from_apollo(apollo_state: dict) -> Optional[dict]:
         # Keys are typically like "Employer:123456" or "EmployerProfile:123456"
         
         for key, value in apollo_state.items():
-            if isinstance(value, dict) and key.startswith("Employer"):
-                logger.debug(f"Found employer data with key: {key}")
-                
-                # Extract relevant fields - handle different key names
-                rating = value.get("overallRating") or value.get("overall_rating") or value.get("rating")
-                review_count = value.get("reviewCount") or value.get("review_count") or value.get("numReviews")
-                name = value.get("name") or value.get("companyName")
-                industry = value.get("industry")
-                
-                if rating or name:
-                    return {
-                        "name": name,
-                        "rating": float(rating) if rating else None,
-                        "review_count": int(review_count) if review_count else None,
-                        "industry": industry,
-                        "snippet": f"Glassdoor rating: {rating}/5.0" if rating else "Company on Glassdoor"
-                    }
-        
+            # Cheap string prefix check before the type check
+            if not key.startswith("Employer") or not isinstance(value, dict):
+                continue
+            logger.debug(f"Found employer data with key: {key}")
+            
+            # Extract relevant fields - handle different key names
+            rating = _first(value, _RATING_KEYS)
+            review_count = _first(value, _REVIEW_KEYS)
+            name = _first(value, _NAME_KEYS)
+            industry = value.get("industry")
+            
+            if rating or name:
+                return {
+                    "name": name,
+                    "rating": float(rating) if rating else None,
+                    "review_count": int(review_count) if review_count else None,
+                    "industry": industry,
+                    "snippet": f"Glassdoor rating: {rating}/5.0" if rating else "Company on Glassdoor"
+                }
+    
         logger.debug("No employer data found in Apollo state")
         return None
         
@@ -252,72 +389,111 @@ def parse_employer_from_apollo(apollo_state: dict) -> Optional[dict]:
         return None
 
 
-def scrape_html_structure(html: str, company_id: int) -> Optional[dict]:
+def _read_jsonld(scripts, rating, review_count, company_name):
+    """Fold rating, review count and name from JSON-LD script bodies into the given values."""
+    for script_content in scripts:
+        # Substring check is far cheaper than decoding blobs that carry none of our fields
+        if not any(marker in script_content for marker in _JSONLD_MARKERS):
+            continue
+        try:
+            data = orjson.loads(script_content)
+            if isinstance(data, dict):
+                if 'ratingValue' in data:
+                    rating = float(data.get('ratingValue'))
+                if 'reviewCount' in data or 'numberOfReviews' in data:
+                    review_count = int(data.get('reviewCount') or data.get('numberOfReviews'))
+                if 'name' in data:
+                    company_name = data.get('name')
+        except Exception as e:
+            logger.debug(f"Could not parse JSON-LD: {e}")
+        
+        if rating is not None and review_count is not None and company_name is not None:
+            break
+    return rating, review_count, company_name
+
+
+def scrape_html_structure(html: bytes, company_id: int) -> Optional[dict]:
     """
-    Parse Glassdoor data directly from HTML structure using BeautifulSoup.
+    Parse Glassdoor data directly from HTML structure using selectolax (lexbor).
     
+    JSON-LD is read straight from the raw bytes; the DOM is only built when
+    JSON-LD leaves the name, rating, or review count missing.
     Falls back to mock data if real scraping returns no data.
     
     Args:
-        html: HTML content of Glassdoor page
+        html: Raw HTML bytes of Glassdoor page
         company_id: Company ID (for fallback to mock data)
         
     Returns:
         Dict with company data or None
     """
     try:
-        soup = BeautifulSoup(html, 'html.parser')
-        
         # Look for rating in various places
         rating = None
         review_count = None
         company_name = None
         
-        # Look for company name in title or header
-        title_tag = soup.find('h1') or soup.find('title')
-        if title_tag:
-            text = title_tag.get_text()
-            if ' - ' in text:
-                company_name = text.split(' - ')[0].strip()
-        
         # Try to find rating data in script tags (JSON-LD or similar)
-        for script in soup.find_all('script', type='application/ld+json'):
-            try:
-                data = json.loads(script.string)
-                if isinstance(data, dict):
-                    if 'ratingValue' in data:
-                        rating = float(data.get('ratingValue'))
-                    if 'reviewCount' in data or 'numberOfReviews' in data:
-                        review_count = int(data.get('reviewCount') or data.get('numberOfReviews'))
-                    if 'name' in data:
-                        company_name = data.get('name')
-            except Exception as e:
-                logger.debug(f"Could not parse JSON-LD: {e}")
+        jsonld_scripts = _JSONLD_SCRIPT_RE.findall(html)
+        rating, review_count, company_name = _read_jsonld(
+            jsonld_scripts, rating, review_count, company_name
+        )
+        
+        # Review count straight from the raw bytes before any tree traversal
+        if not review_count:
+            match = _RAW_REVIEW_COUNT_RE.search(html)
+            if match:
+                try:
+                    review_count = int(match.group(1).replace(b',', b''))
+                except ValueError:
+                    pass
+        
+        # Everything found without the DOM: skip building it
+        if rating and review_count and company_name:
+            return {
+                "name": company_name,
+                "rating": rating,
+                "review_count": review_count,
+                "snippet": f"Glassdoor rating: {rating}/5.0"
+            }
+        
+        tree = LexborHTMLParser(html)
+        
+        # Script tags the raw regex could not see (e.g. unquoted type attribute)
+        if not jsonld_scripts:
+            rating, review_count, company_name = _read_jsonld(
+                (script.text().encode() for script in tree.css('script[type="application/ld+json"]')),
+                rating, review_count, company_name,
+            )
+        
+        # Look for company name in title or header (JSON-LD name takes precedence)
+        if not company_name:
+            title_tag = tree.css_first('h1') or tree.css_first('title')
+            if title_tag:
+                text = title_tag.text()
+                if ' - ' in text:
+                    company_name = text.split(' - ')[0].strip()
         
         # Look for rating in data attributes and spans
         if not rating:
             # Look for elements with rating values
-            rating_patterns = [
-                soup.find(attrs={'data-test': 'employer-rating'}),
-                soup.find('span', class_=re.compile(r'rating', re.I)),
-                soup.find(attrs={'class': re.compile(r'rating', re.I)}),
-            ]
-            for elem in rating_patterns:
+            for selector in _RATING_SELECTORS:
+                elem = tree.css_first(selector)
                 if elem:
                     try:
-                        rating_text = elem.get_text(strip=True)
+                        rating_text = elem.text(strip=True)
                         rating = float(rating_text.split()[0])
                         break
                     except (ValueError, IndexError):
                         pass
         
-        # Look for review count - search more thoroughly
+        # Look for review count - per-element scan, only if the raw scan missed
         if not review_count:
             # Look for review count in various elements
-            for elem in soup.find_all(['span', 'div', 'p']):
-                text = elem.get_text(strip=True).lower()
+            for elem in tree.css('span, div, p'):
+                text = elem.text(strip=True).lower()
                 # Match patterns like "12,450 reviews" or "12450 reviews"
-                match = re.search(r'([\d,]+)\s*reviews?', text)
+                match = _REVIEW_COUNT_RE.search(text)
                 if match:
                     try:
                         review_count = int(match.group(1).replace(',', ''))
@@ -9,8 +9,14 @@ from app.models.company import SourceSignal
 
 logger = logging.getLogger(__name__)
 
+# Flip on once the Selenium integration lands; the aggregator skips the connector until then
+LINKEDIN_ENABLED = False
 
-async def fetch_linkedin_signals(company_name: str) -> list[SourceSignal]:
+# Shared empty result so the stub doesn't allocate a list per call
+_EMPTY: tuple[SourceSignal, ...] = ()
+
+
+async def fetch_linkedin_signals(company_name: str) -> tuple[SourceSignal, ...]:
     """
     Fetch signals from LinkedIn about a company.
     
@@ -33,15 +39,13 @@ async def fetch_linkedin_signals(company_name: str) -> list[SourceSignal]:
         company_name: Name of the company to search
         
     Returns:
-        List of SourceSignal objects from LinkedIn
+        Tuple of SourceSignal objects from LinkedIn
     """
-    logger.debug(f"LinkedIn connector stub called for: {company_name}")
-    
-    # Stub: return empty list
+    # Stub: return the shared empty tuple
     # This connector is optional and requires Selenium setup
     # Enable when ready: return await _fetch_linkedin_with_selenium(company_name)
     
-    return []
+    return _EMPTY
 
 
 async def _fetch_linkedin_with_selenium(company_name: str) -> list[SourceSignal]:
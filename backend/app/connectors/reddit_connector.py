@@ -3,30 +3,27 @@ Reddit data connector.
 Fetches posts and comments about companies by scraping old.reddit.com.
 
 Design notes:
-- Uses requests + BeautifulSoup for search (server-rendered old.reddit.com)
+- Uses the shared async httpx client + lxml with precompiled XPath (server-rendered old.reddit.com)
+- Runs query searches and post fetches concurrently, bounded by a per-host semaphore
 - Keeps Selenium only as an optional fallback for edge cases
 - Adds user-agent rotation, jittered delays, and retry/backoff
 - Improves sentiment via VADER with engagement-based confidence
 - Filters noisy comments ([deleted], bots, AutoModerator)
 """
 
+import hashlib
 import logging
 import time
 import re
 import math
 import random
 import asyncio
+from functools import lru_cache
 from typing import Optional, Tuple, List
-from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote_plus
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
+import lxml.html
+from lxml import etree
 
 try:
     from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
@@ -36,11 +33,16 @@ except Exception:
 
 from app.models.company import SourceSignal
 from app.core.config import settings
+from app.core.http import get_with_retry
+from app.services.cache import get_cache_service
 
 logger = logging.getLogger(__name__)
 
-# Thread pool for running synchronous code
-_executor = ThreadPoolExecutor(max_workers=4)
+# Caps in-flight requests to old.reddit.com across all lookups
+_REDDIT_SEM = asyncio.Semaphore(settings.PER_HOST_CONCURRENCY)
+
+# Search results churn faster than post pages; posts use CACHE_TTL_SECONDS
+_SEARCH_CACHE_TTL_SECONDS = 1800
 
 # Rotating User-Agents to reduce fingerprinting
 _UA_POOL = [
@@ -51,34 +53,77 @@ _UA_POOL = [
 ]
 
 
+def _has_class(name: str) -> str:
+    """XPath predicate matching elements whose class list contains ``name``."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# old.reddit.com always serves UTF-8; don't let libxml2 guess from bytes
+_HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+# Precompiled XPaths for the search and comment pages
+_XP_SEARCH_TITLES = etree.XPath(f"//a[{_has_class('search-title')}]")
+_XP_TITLE = etree.XPath(f"(//a[{_has_class('title')}])[1]")
+_XP_SCORE = etree.XPath(f"(//div[{_has_class('score')} and {_has_class('unvoted')}])[1]/@title")
+_XP_COMMENT_ENTRIES = etree.XPath(f"(//div[{_has_class('commentarea')}])[1]//div[{_has_class('entry')}]")
+_XP_AUTHOR = etree.XPath(f"(.//p[{_has_class('tagline')}]//a[{_has_class('author')}])[1]")
+_XP_BODY = etree.XPath(f"(.//form//div[{_has_class('md')}])[1]")
+_XP_COMMENTS_LINK = etree.XPath(f"(//a[{_has_class('comments')}])[1]")
+
+# Post URL host rewrite and comment-count patterns, compiled once
+_RE_NORMALIZE_HOST = re.compile(r"^https?://(?:www|new|np)\.reddit\.com")
+_RE_NUM = re.compile(r"(\d+)")
+
+# Comment noise: removed placeholders, bot disclaimers, and "bot ... help" boilerplate
+_RE_NOISE = re.compile(
+    r"^\s*\[(?:deleted|removed)\]\s*$|i am a bot|^(?=.*bot)(?=.*help)",
+    re.IGNORECASE | re.DOTALL,
+)
+_NOISE_AUTHORS = frozenset({"automoderator"})
+
+# VADER label to SourceSignal sentiment literal
+_SENT_MAP = {"positive": "pos", "negative": "neg", "neutral": "neutral"}
+
+# Start of old.reddit's main column; header and sidebar markup precede it
+_RE_MAIN_CONTENT = re.compile(rb'<div[^>]*\bclass="content"')
+
+
+def _main_content(html: bytes) -> bytes:
+    """
+    Slice the page down to the main content column before parsing.
+    
+    Everything we read (search results, post title/score, comment area)
+    lives in ``div.content``; the header and sidebar before it are never
+    built into the tree. Falls back to the whole page if the marker is missing.
+    """
+    match = _RE_MAIN_CONTENT.search(html)
+    return html[match.start():] if match else html
+
+
+# Compressed, HTML-only responses; the shared client decodes gzip and br transparently
+_BASE_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Encoding": "gzip, br",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
 def _random_ua() -> str:
     return random.choice(_UA_POOL)
 
 
 def _jitter_sleep(base: float = 0.8, spread: float = 0.7):
-    """Sleep with jitter to avoid fixed timing patterns."""
+    """Sleep with jitter to avoid fixed timing patterns (Selenium thread only)."""
     delay = max(0.1, base + random.uniform(-spread, spread))
     time.sleep(delay)
 
 
-def _requests_session() -> requests.Session:
-    """Configure a requests session with retry/backoff."""
-    session = requests.Session()
-    retries = Retry(
-        total=3,
-        backoff_factor=0.6,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["GET"],
-        raise_on_status=False,
-    )
-    adapter = HTTPAdapter(max_retries=retries)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    return session
-
-
 def _setup_driver(headless=True):
     """Setup Selenium Chrome driver with optimal settings."""
+    # Imported lazily: Selenium is only needed for the optional fallback
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
     options = Options()
     if headless:
         options.add_argument("--headless=new")
@@ -93,26 +138,34 @@ def _setup_driver(headless=True):
     return webdriver.Chrome(options=options)
 
 
-def _search_reddit_posts_requests(query: str, max_results: int = 5) -> List[Tuple[str, str]]:
-    """Search Reddit using requests + BeautifulSoup. Returns list of (url, title)."""
-    session = _requests_session()
+async def _search_reddit_posts(query: str, max_results: int = 5, force_refresh: bool = False) -> List[Tuple[str, str]]:
+    """Search Reddit using the shared HTTP client + lxml. Returns list of (url, title)."""
+    cache = get_cache_service()
+    cache_key = f"reddit:search:{hashlib.sha1(f'{max_results}:{query}'.encode()).hexdigest()}"
+    if not force_refresh:
+        cached = await cache.get_json(cache_key)
+        if cached is not None:
+            logger.debug(f"Reddit search cache hit for query: {query}")
+            return [tuple(item) for item in cached]
+
     encoded_query = quote_plus(query)
     url = f"https://old.reddit.com/search?q={encoded_query}&sort=relevance&t=all&type=link"
 
-    headers = {"User-Agent": _random_ua()}
+    headers = {**_BASE_HEADERS, "User-Agent": _random_ua()}
     try:
-        logger.info(f"Searching Reddit (requests): {url}")
-        resp = session.get(url, headers=headers, timeout=15)
+        logger.info(f"Searching Reddit (http): {url}")
+        async with _REDDIT_SEM:
+            resp = await get_with_retry(url, headers=headers)
         if resp.status_code != 200:
             logger.warning(f"Search request failed ({resp.status_code}) for {url}")
             return []
 
-        soup = BeautifulSoup(resp.text, "html.parser")
+        tree = lxml.html.fromstring(_main_content(resp.content), parser=_HTML_PARSER)
         results: List[Tuple[str, str]] = []
         seen = set()
-        for a in soup.select("a.search-title"):
+        for a in _XP_SEARCH_TITLES(tree):
             href = a.get("href")
-            title = (a.text or "").strip()
+            title = a.text_content().strip()
             if not href or "/comments/" not in href:
                 continue
             if href in seen:
@@ -123,15 +176,18 @@ def _search_reddit_posts_requests(query: str, max_results: int = 5) -> List[Tupl
                 break
 
         logger.info(f"Found {len(results)} posts for query: {query}")
-        _jitter_sleep(0.6, 0.5)
+        if results:
+            await cache.set_json(cache_key, results, ttl_seconds=_SEARCH_CACHE_TTL_SECONDS)
         return results
     except Exception as e:
-        logger.error(f"Error searching Reddit via requests: {e}")
+        logger.error(f"Error searching Reddit via http: {e}")
         return []
 
 
 def _search_reddit_posts_selenium(query: str, max_results=5, headless=True) -> List[Tuple[str, str]]:
     """Selenium fallback search. Returns list of (url, title)."""
+    from selenium.webdriver.common.by import By
+
     driver = None
     try:
         driver = _setup_driver(headless=headless)
@@ -178,90 +234,119 @@ def _search_reddit_posts_selenium(query: str, max_results=5, headless=True) -> L
             driver.quit()
 
 
-def _fetch_post_details(post_url: str):
+async def _fetch_post_details(post_url: str, force_refresh: bool = False):
     """
     Fetch post details and comments from old.reddit.com.
     Returns dict with title, score, num_comments, comments_text.
     """
     # Ensure we use old.reddit.com
-    post_url = re.sub(r"^https?://(www|new|np)\.reddit\.com", "https://old.reddit.com", post_url)
+    post_url = _RE_NORMALIZE_HOST.sub("https://old.reddit.com", post_url)
+    
+    cache = get_cache_service()
+    cache_key = f"reddit:post:{post_url}"
+    if not force_refresh:
+        cached = await cache.get_json(cache_key)
+        if cached is not None:
+            logger.debug(f"Reddit post cache hit: {post_url}")
+            return cached
     
-    headers = {"User-Agent": _random_ua()}
+    headers = {**_BASE_HEADERS, "User-Agent": _random_ua()}
     
     try:
         logger.debug(f"Fetching post: {post_url}")
-        session = _requests_session()
-        response = session.get(post_url, headers=headers, timeout=15)
+        async with _REDDIT_SEM:
+            # Polite jitter while holding the slot paces requests per second, not per post
+            await asyncio.sleep(random.uniform(0.2, 0.6))
+            response = await get_with_retry(post_url, headers=headers)
         
         if response.status_code != 200:
             logger.warning(f"Failed to fetch {post_url} (status {response.status_code})")
             return None
         
-        soup = BeautifulSoup(response.text, "html.parser")
+        tree = lxml.html.fromstring(_main_content(response.content), parser=_HTML_PARSER)
         
         # Extract post metadata
-        title_elem = soup.select_one("a.title")
-        title = title_elem.text.strip() if title_elem else "Unknown"
+        title_elems = _XP_TITLE(tree)
+        title = title_elems[0].text_content().strip() if title_elems else "Unknown"
         
         # Extract score
         score = 0
-        score_elem = soup.select_one("div.score.unvoted")
-        if score_elem:
-            score_text = score_elem.get("title", "0")
+        score_titles = _XP_SCORE(tree)
+        if score_titles:
             try:
-                score = int(score_text)
+                score = int(score_titles[0])
             except ValueError:
                 pass
         
         # Extract comments (prefer top-level, filter noise)
         comments: List[str] = []
-        comment_area = soup.select_one("div.commentarea")
-        if comment_area:
-            for comment_div in comment_area.select("div.entry"):
-                # Skip AutoModerator/bots
-                author = None
-                tagline = comment_div.select_one("p.tagline a.author")
-                if tagline:
-                    author = (tagline.text or "").strip()
-                if author and author.lower() in {"automoderator"}:
-                    continue
-                body_elem = comment_div.select_one("form div.md")
-                if not body_elem:
-                    continue
-                text = body_elem.get_text("\n").strip()
-                if not text:
-                    continue
-                tl = text.lower()
-                if tl in {"[deleted]", "[removed]"}:
-                    continue
-                if "i am a bot" in tl or "bot" in tl and "help" in tl:
-                    continue
-                if len(text) <= 10:
-                    continue
-                comments.append(text)
+        for comment_div in _XP_COMMENT_ENTRIES(tree):
+            # Skip AutoModerator/bots
+            author = None
+            tagline = _XP_AUTHOR(comment_div)
+            if tagline:
+                author = tagline[0].text_content().strip()
+            if author and author.lower() in _NOISE_AUTHORS:
+                continue
+            body_elems = _XP_BODY(comment_div)
+            if not body_elems:
+                continue
+            text = body_elems[0].text_content().strip()
+            # Too short to carry signal, removed, or bot boilerplate
+            if len(text) <= 10 or _RE_NOISE.search(text):
+                continue
+            comments.append(text)
         
         # Get number of comments from post info
         num_comments = len(comments)
-        comments_elem = soup.select_one("a.comments")
-        if comments_elem:
-            comments_text = comments_elem.text
-            match = re.search(r'(\d+)', comments_text)
+        comments_elems = _XP_COMMENTS_LINK(tree)
+        if comments_elems:
+            comments_text = comments_elems[0].text_content()
+            match = _RE_NUM.search(comments_text)
             if match:
                 num_comments = int(match.group(1))
         
-        return {
+        details = {
             "title": title,
             "url": post_url,
             "score": score,
             "num_comments": num_comments,
             "comments": comments[:20],  # Limit
         }
+        await cache.set_json(cache_key, details)
+        return details
         
     except Exception as e:
         logger.error(f"Error fetching post details from {post_url}: {e}")
         return None
 
 
+# Engagement confidence min(1, log1p(n) / 3) by comment count; it saturates at
+# n = 20 (log1p(20) / 3 > 1), so larger counts never need the table
+_CONF_LUT = tuple(min(1.0, math.log1p(n) / 3.0) for n in range(20))
+
+
+# Comment lengths worth scoring, and the sample size before early exit is allowed
+_MIN_SCORED_LEN = 30
+_MAX_SCORED_LEN = 1000
+_EARLY_EXIT_MIN = 6
+
+
+def _label_settled(total: float, total_sq: float, count: int) -> bool:
+    """True when the 95% CI of the mean compound lies wholly on one side of each ±0.05 threshold."""
+    mean = total / count
+    variance = max(0.0, (total_sq - count * mean * mean) / (count - 1))
+    half_width = 1.96 * math.sqrt(variance / count)
+    low, high = mean - half_width, mean + half_width
+    return low >= 0.05 or high <= -0.05 or (low > -0.05 and high < 0.05)
+
+
+@lru_cache(maxsize=4096)
+def _vader_compound(text: str) -> float:
+    """VADER compound score for a comment; repeated comments across posts are scored once."""
+    return _vader.polarity_scores(text)["compound"]
+
+
 def _analyze_sentiment(comments: list[str], score: int, num_comments: int) -> Tuple[str, float]:
     """
     Analyze sentiment using VADER if available; fallback to neutral.
@@ -277,15 +362,27 @@ def _analyze_sentiment(comments: list[str], score: int, num_comments: int) -> Tu
         return base, 0.2
 
     if _vader:
-        compounds = []
-        for c in comments[:15]:
+        # Most substantive comments first; very short or wall-of-text ones add noise
+        candidates = sorted(
+            (c for c in comments if _MIN_SCORED_LEN <= len(c) <= _MAX_SCORED_LEN),
+            key=len,
+            reverse=True,
+        )[:15] or comments[:15]
+        total = total_sq = 0.0
+        count = 0
+        for c in candidates:
             try:
-                compounds.append(_vader.polarity_scores(c)["compound"])
+                compound = _vader_compound(c)
             except Exception:
                 continue
-        if not compounds:
+            total += compound
+            total_sq += compound * compound
+            count += 1
+            if count >= _EARLY_EXIT_MIN and _label_settled(total, total_sq, count):
+                break
+        if not count:
             return "neutral", 0.3
-        avg = sum(compounds) / len(compounds)
+        avg = total / count
         # Label thresholds per VADER guidance
         if avg >= 0.05:
             label = "positive"
@@ -293,18 +390,41 @@ def _analyze_sentiment(comments: list[str], score: int, num_comments: int) -> Tu
             label = "negative"
         else:
             label = "neutral"
-        # Engagement-based confidence (log scale)
-        conf = min(1.0, math.log1p(max(0, num_comments)) / 3.0)
+        # Engagement-based confidence (log scale), saturating at 1.0
+        n = max(0, num_comments)
+        conf = _CONF_LUT[n] if n < len(_CONF_LUT) else 1.0
         return label, conf
 
     # Fallback: neutral with minimal confidence
     return "neutral", 0.2
 
 
-def _scrape_reddit_for_company(company_name: str, max_posts_per_query=3, use_selenium_fallback: bool = False):
+async def _search_query(
+    query: str,
+    max_results: int,
+    use_selenium_fallback: bool,
+    force_refresh: bool = False
+) -> List[Tuple[str, str]]:
+    """Run one search query, falling back to Selenium (in a thread) if enabled and empty."""
+    logger.info(f"Searching Reddit with query: {query}")
+    posts = await _search_reddit_posts(query, max_results=max_results, force_refresh=force_refresh)
+    if not posts and use_selenium_fallback:
+        logger.info("No results via http; trying Selenium fallback...")
+        posts = await asyncio.to_thread(_search_reddit_posts_selenium, query, max_results, True)
+    return posts
+
+
+async def _scrape_reddit_for_company(
+    company_name: str,
+    max_posts_per_query=3,
+    use_selenium_fallback: bool = False,
+    force_refresh: bool = False
+):
     """
-    Synchronous function to scrape Reddit for company information.
-    Searches multiple query variations and returns list of post details.
+    Scrape Reddit for company information.
+    Searches multiple query variations concurrently, then fetches all
+    distinct posts concurrently, and returns list of post details.
+    Search results and post details are cached in Redis unless force_refresh.
     """
     queries = [
         f'"{company_name}" internship',
@@ -313,40 +433,34 @@ def _scrape_reddit_for_company(company_name: str, max_posts_per_query=3, use_sel
         f'"{company_name}" experience',
     ]
     
-    all_results = []
-    seen_urls = set()
+    searches = await asyncio.gather(
+        *[_search_query(query, max_posts_per_query, use_selenium_fallback, force_refresh) for query in queries],
+        return_exceptions=True
+    )
     
+    post_urls = []
+    seen_urls = set()
     failed_queries = 0
-    for query in queries:
-        try:
-            logger.info(f"Searching Reddit with query: {query}")
-            posts = _search_reddit_posts_requests(query, max_results=max_posts_per_query)
-            if not posts and use_selenium_fallback:
-                logger.info("No results via requests; trying Selenium fallback...")
-                posts = _search_reddit_posts_selenium(query, max_results=max_posts_per_query, headless=True)
-            
-            for post_url, title in posts:
-                if post_url in seen_urls:
-                    continue
-                seen_urls.add(post_url)
-                
-                # Fetch post details
-                details = _fetch_post_details(post_url)
-                if details:
-                    all_results.append(details)
-                
-                # Polite jitter
-                _jitter_sleep(0.9, 0.7)
-                
-        except Exception as e:
-            logger.error(f"Error processing query '{query}': {e}")
+    for query, posts in zip(queries, searches):
+        if isinstance(posts, Exception):
+            logger.error(f"Error processing query '{query}': {posts}")
             failed_queries += 1
             continue
+        for post_url, title in posts:
+            if post_url in seen_urls:
+                continue
+            seen_urls.add(post_url)
+            post_urls.append(post_url)
+    
+    # Fetch post details; order follows the query order above
+    details = await asyncio.gather(*[_fetch_post_details(post_url, force_refresh) for post_url in post_urls])
+    all_results = [d for d in details if d]
+    
     logger.info(f"Scrape summary for '{company_name}': results={len(all_results)} failed_queries={failed_queries}")
     return all_results
 
 
-async def fetch_reddit_signals(company_name: str) -> list[SourceSignal]:
+async def fetch_reddit_signals(company_name: str, force_refresh: bool = False) -> list[SourceSignal]:
     """
     Fetch signals from Reddit about a company by scraping old.reddit.com.
     
@@ -358,6 +472,7 @@ async def fetch_reddit_signals(company_name: str) -> list[SourceSignal]:
     
     Args:
         company_name: Name of the company to search
+        force_refresh: Bypass the cached search results and post details
         
     Returns:
         List of SourceSignal objects from Reddit
@@ -367,13 +482,7 @@ async def fetch_reddit_signals(company_name: str) -> list[SourceSignal]:
     try:
         logger.info(f"Fetching Reddit signals for: {company_name}")
         
-        # Run the scraping in a thread pool since it's synchronous
-        try:
-            loop = asyncio.get_running_loop()
-            results = await loop.run_in_executor(_executor, _scrape_reddit_for_company, company_name, 3, False)
-        except RuntimeError:
-            # In case no running loop (older environments), fallback
-            results = await asyncio.to_thread(_scrape_reddit_for_company, company_name, 3, False)
+        results = await _scrape_reddit_for_company(company_name, 3, False, force_refresh)
         
         # Convert results to SourceSignal objects
         for post_data in results:
@@ -392,13 +501,11 @@ async def fetch_reddit_signals(company_name: str) -> list[SourceSignal]:
                     post_data["num_comments"]
                 )
                 # Map VADER label to model's allowed sentiment literals
-                sentiment_literal = {
-                    "positive": "pos",
-                    "negative": "neg",
-                    "neutral": "neutral",
-                }.get(label, "neutral")
+                sentiment_literal = _SENT_MAP.get(label, "neutral")
 
-                signal = SourceSignal(
+                # Every field is produced by the parser above with the right type,
+                # so skip per-field validation
+                signal = SourceSignal.model_construct(
                     platform="reddit",
                     url=post_data["url"],
                     title=post_data["title"],
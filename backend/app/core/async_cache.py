@@ -0,0 +1,116 @@
+"""
+In-process TTL cache and single-flight helpers for async functions.
+Used to memoize connector fetches so repeated lookups skip the network.
+"""
+
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key into one in-flight call.
+
+    The first caller for a key (the owner) runs the call; callers arriving
+    while it is pending await the owner's result or exception. If the owner
+    is cancelled (e.g. by a timeout), waiters are not cancelled with it:
+    the next waiter in line starts a fresh call instead.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+    async def run(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Await ``func(*args, **kwargs)``, sharing one call per key.
+
+        Args:
+            key: Key identifying equivalent calls
+            func: Coroutine function to call
+            *args, **kwargs: Arguments passed to ``func``
+
+        Returns:
+            Result of the shared call
+        """
+        while (pending := self._inflight.get(key)) is not None:
+            try:
+                # Shield so a cancelled waiter doesn't cancel the shared call
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # Re-raise our own cancellation; retry if only the owner was cancelled
+                if not pending.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so a call without waiters doesn't log a warning
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+
+def async_ttl_cache(
+    maxsize: int = 1024,
+    ttl: float = 3600,
+    key: Optional[Callable[..., Hashable]] = None,
+):
+    """
+    Cache results of an async function in memory with LRU eviction and a TTL.
+
+    Only truthy results are stored, so an empty result from a failed or
+    blocked scrape is retried on the next call instead of being pinned for
+    the whole TTL. Concurrent misses for the same key are coalesced into a
+    single call through SingleFlight. The undecorated coroutine is available
+    as ``__wrapped__`` for callers that need to bypass the cache.
+
+    Args:
+        maxsize: Maximum number of entries kept before evicting the oldest
+        ttl: Entry lifetime in seconds
+        key: Optional function mapping call arguments to a cache key
+
+    Returns:
+        Decorator for async functions
+    """
+    def decorator(func):
+        cache: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        flight = SingleFlight()
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+
+            entry = cache.get(cache_key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    cache.move_to_end(cache_key)
+                    return value
+                del cache[cache_key]
+
+            result = await flight.run(cache_key, func, *args, **kwargs)
+            if result:
+                cache[cache_key] = (now + ttl, result)
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return result
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
@@ -3,6 +3,8 @@ Configuration settings for the backend application.
 Uses environment variables with Pydantic Settings.
 """
 
+import os
+
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -18,16 +20,21 @@ class Settings(BaseSettings):
     # Server
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    WORKERS: int = os.cpu_count() or 1  # Used outside DEBUG; one event loop per core
+    FORWARDED_ALLOW_IPS: str = "127.0.0.1"  # Proxies trusted for X-Forwarded-* headers
     
     # CORS
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://localhost:5173"]
     CORS_ALLOW_CREDENTIALS: bool = True
     CORS_ALLOW_METHODS: list[str] = ["*"]
-    CORS_ALLOW_HEADERS: list[str] = ["*"]
+    CORS_ALLOW_HEADERS: list[str] = ["Authorization", "Content-Type", "If-None-Match", "X-Requested-With"]
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     CACHE_TTL_SECONDS: int = 86400  # 24 hours
+    LOCAL_CACHE_TTL_SECONDS: int = 30  # In-process tier in front of Redis
+    LOCAL_CACHE_MAXSIZE: int = 1024
+    CACHE_VALIDATE_ON_READ: bool = False  # Re-validate cache hits to catch corrupt entries in dev
     
     # Database
     DATABASE_URL: Optional[str] = None
@@ -42,6 +49,12 @@ class Settings(BaseSettings):
     # Timeouts and limits
     HTTP_TIMEOUT_SECONDS: int = 10
     MAX_CONCURRENT_REQUESTS: int = 5
+    PER_HOST_CONCURRENCY: int = 4
+    CONNECTOR_TIMEOUT_SECONDS: float = 15.0
+    
+    # In-process connector result cache
+    CONNECTOR_CACHE_TTL_SECONDS: int = 3600
+    CONNECTOR_CACHE_MAXSIZE: int = 1024
     
     class Config:
         env_file = ".env"
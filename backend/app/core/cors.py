@@ -0,0 +1,162 @@
+"""
+Pure-ASGI CORS middleware.
+Behaves like Starlette's CORSMiddleware for the options this app configures, but
+reads request headers straight from the ASGI scope and prebuilds every response
+header as bytes when the app starts.
+"""
+
+from typing import Sequence
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+ALL_METHODS = ("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT")
+SAFELISTED_HEADERS = frozenset({"Accept", "Accept-Language", "Content-Language", "Content-Type"})
+
+_ALLOW_ORIGIN = b"access-control-allow-origin"
+_ALLOW_HEADERS = b"access-control-allow-headers"
+_VARY = b"vary"
+
+
+class PureASGICORSMiddleware:
+    """
+    CORS middleware working directly on ASGI messages.
+
+    Preflight requests are answered without calling the app; other requests
+    get the CORS headers appended to their ``http.response.start`` message.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allow_origins: Sequence[str] = (),
+        allow_methods: Sequence[str] = ("GET",),
+        allow_headers: Sequence[str] = (),
+        allow_credentials: bool = False,
+        max_age: int = 600,
+    ) -> None:
+        if "*" in allow_methods:
+            allow_methods = ALL_METHODS
+
+        self.app = app
+        self.allow_all_origins = "*" in allow_origins
+        self.allow_all_headers = "*" in allow_headers
+        self.allow_origins = frozenset(origin.encode("latin-1") for origin in allow_origins)
+        self.allow_methods = frozenset(method.encode("latin-1") for method in allow_methods)
+        allow_headers = sorted(SAFELISTED_HEADERS | set(allow_headers))
+        self.allow_headers = frozenset(h.lower() for h in allow_headers)
+        # Credentialed responses may not use the "*" wildcard origin
+        self.explicit_origin = not self.allow_all_origins or allow_credentials
+
+        credentials = ((b"access-control-allow-credentials", b"true"),) if allow_credentials else ()
+        self.simple_headers = credentials
+
+        preflight = [
+            (b"access-control-allow-methods", ", ".join(allow_methods).encode("latin-1")),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+            *credentials,
+        ]
+        if self.explicit_origin:
+            preflight.append((_VARY, b"Origin"))
+        else:
+            preflight.append((_ALLOW_ORIGIN, b"*"))
+        if not self.allow_all_headers:
+            preflight.append((_ALLOW_HEADERS, ", ".join(allow_headers).encode("latin-1")))
+        self.preflight_headers = tuple(preflight)
+
+    def _origin_allowed(self, origin: bytes) -> bool:
+        return self.allow_all_origins or origin in self.allow_origins
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = request_method = request_headers = None
+        has_cookie = False
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+            elif name == b"cookie":
+                has_cookie = True
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self._preflight(origin, request_method, request_headers, send)
+            return
+
+        await self.app(scope, receive, self._wrap_send(send, origin, has_cookie))
+
+    async def _preflight(
+        self,
+        origin: bytes,
+        request_method: bytes,
+        request_headers: bytes | None,
+        send: Send,
+    ) -> None:
+        """Answer a CORS preflight request without calling the app."""
+        headers = list(self.preflight_headers)
+        failures = []
+
+        if self._origin_allowed(origin):
+            if self.explicit_origin:
+                headers.append((_ALLOW_ORIGIN, origin))
+        else:
+            failures.append("origin")
+
+        if request_method not in self.allow_methods:
+            failures.append("method")
+
+        if self.allow_all_headers and request_headers is not None:
+            headers.append((_ALLOW_HEADERS, request_headers))
+        elif request_headers:
+            for header in request_headers.decode("latin-1").lower().split(","):
+                if header.strip() not in self.allow_headers:
+                    failures.append("headers")
+                    break
+
+        if failures:
+            status, body = 400, ("Disallowed CORS " + ", ".join(failures)).encode()
+        else:
+            status, body = 200, b"OK"
+        headers.append((b"content-type", b"text/plain; charset=utf-8"))
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    def _wrap_send(self, send: Send, origin: bytes, has_cookie: bool) -> Send:
+        """Wrap ``send`` to add CORS headers to the response start message."""
+        if self.allow_all_origins and not has_cookie:
+            extra = (*self.simple_headers, (_ALLOW_ORIGIN, b"*"))
+            echo_origin = False
+        else:
+            extra = self.simple_headers
+            echo_origin = self._origin_allowed(origin)
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                headers.extend(extra)
+                if echo_origin:
+                    headers.append((_ALLOW_ORIGIN, origin))
+                    _add_vary_origin(headers)
+                message["headers"] = headers
+            await send(message)
+
+        return send_with_cors
+
+
+def _add_vary_origin(headers: list[tuple[bytes, bytes]]) -> None:
+    """Add Origin to the Vary header, merging with an existing value."""
+    for i, (name, value) in enumerate(headers):
+        if name == _VARY:
+            headers[i] = (_VARY, value + b", Origin")
+            return
+    headers.append((_VARY, b"Origin"))
@@ -0,0 +1,134 @@
+"""
+Shared HTTP client for outbound scraping.
+Keeps a single pooled HTTP/2 httpx.AsyncClient so connectors reuse TCP/TLS connections
+and multiplex requests to the same host. The app lifespan creates it on startup and
+publishes it as ``app.state.http``; route code should use that (or get_http_client())
+rather than opening a per-request ``httpx.AsyncClient``.
+"""
+
+import asyncio
+import logging
+import random
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Desktop User-Agent to avoid blocking
+DESKTOP_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/91.0.4472.124 Safari/537.36"
+)
+
+# Fail fast on unreachable hosts; slow bodies get the configured read budget
+CONNECT_TIMEOUT_SECONDS = 3.0
+
+# Upstream statuses worth retrying; anything else is returned to the caller as-is
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+# Global HTTP client instance
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get or initialize the global HTTP client."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.HTTP_TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS),
+            follow_redirects=True,
+            headers={"User-Agent": DESKTOP_USER_AGENT},
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            http2=True,
+        )
+        logger.debug("Initialized shared HTTP client")
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the global HTTP client and release pooled connections."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        logger.debug("Closed shared HTTP client")
+
+
+async def _backoff(attempt: int) -> None:
+    """Sleep with jittered exponential backoff before the next attempt."""
+    await asyncio.sleep(random.uniform(0.5, 1.5) * 2 ** attempt)
+
+
+async def get_with_retry(url: str, attempts: int = 3, **kwargs) -> httpx.Response:
+    """
+    GET a URL with the shared client, retrying transient failures.
+    
+    Retries on transport errors and on 429/5xx responses with jittered
+    exponential backoff. The last response (or error) is returned (or raised)
+    unchanged once attempts are exhausted.
+    
+    Args:
+        url: URL to fetch
+        attempts: Total number of attempts
+        **kwargs: Extra arguments passed to ``AsyncClient.get``
+        
+    Returns:
+        httpx.Response from the final attempt
+    """
+    client = get_http_client()
+    for attempt in range(attempts):
+        last = attempt == attempts - 1
+        try:
+            response = await client.get(url, **kwargs)
+        except httpx.TransportError as e:
+            if last:
+                raise
+            logger.debug(f"Transient error fetching {url} (attempt {attempt + 1}): {e}")
+        else:
+            if last or response.status_code not in RETRY_STATUS_CODES:
+                return response
+            logger.debug(f"Retryable status {response.status_code} from {url} (attempt {attempt + 1})")
+        await _backoff(attempt)
+
+
+@asynccontextmanager
+async def stream_with_retry(url: str, attempts: int = 3, **kwargs) -> AsyncIterator[httpx.Response]:
+    """
+    Open a streaming GET with the shared client, retrying transient failures.
+    
+    Only opening the stream (up to the response headers) is retried; errors
+    while reading the body propagate to the caller.
+    
+    Args:
+        url: URL to fetch
+        attempts: Total number of attempts
+        **kwargs: Extra arguments passed to ``AsyncClient.build_request``
+        
+    Yields:
+        Streaming httpx.Response, closed on exit
+    """
+    client = get_http_client()
+    for attempt in range(attempts):
+        last = attempt == attempts - 1
+        try:
+            response = await client.send(client.build_request("GET", url, **kwargs), stream=True)
+        except httpx.TransportError as e:
+            if last:
+                raise
+            logger.debug(f"Transient error opening {url} (attempt {attempt + 1}): {e}")
+        else:
+            if last or response.status_code not in RETRY_STATUS_CODES:
+                try:
+                    yield response
+                finally:
+                    await response.aclose()
+                return
+            await response.aclose()
+            logger.debug(f"Retryable status {response.status_code} from {url} (attempt {attempt + 1})")
+        await _backoff(attempt)
@@ -1,11 +1,39 @@
 """
 Structured logging configuration for the application.
-Uses JSON format for organized, machine-readable logs.
+Uses JSON format for organized, machine-readable logs. Records are handed to a
+background thread through a queue, so JSON rendering and stdout writes stay off
+the event loop.
 """
 
+import atexit
 import logging
+import queue
 import sys
-from pythonjsonlogger import jsonlogger
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+try:
+    # python-json-logger 3.1+ ships an orjson-backed formatter
+    from pythonjsonlogger.orjson import OrjsonFormatter as JsonFormatter
+except ImportError:
+    from pythonjsonlogger.jsonlogger import JsonFormatter
+
+
+class _LocalQueueHandler(QueueHandler):
+    """
+    QueueHandler for an in-process queue.
+    
+    The message args are merged on the calling thread, but the record is
+    otherwise passed through as-is, keeping exc_info for the JSON formatter.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_listener: Optional[QueueListener] = None
 
 
 def setup_logging(log_level=logging.INFO):
@@ -15,6 +43,13 @@ def setup_logging(log_level=logging.INFO):
     Args:
         log_level: Logging level (default: INFO)
     """
+    # The JSON format only uses timestamp, level, logger name and message, so
+    # skip collecting caller frame, thread and process details per record
+    logging._srcfile = None
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    
     # Root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
@@ -24,15 +59,24 @@ def setup_logging(log_level=logging.INFO):
         root_logger.removeHandler(handler)
     
     # JSON formatter for structured logs
-    formatter = jsonlogger.JsonFormatter(
+    formatter = JsonFormatter(
         '%(timestamp)s %(levelname)s %(name)s %(message)s',
         timestamp=True
     )
     
-    # Console handler
+    # Console handler, fed from the queue by a listener thread
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+    else:
+        atexit.register(_stop_listener)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, console_handler)
+    _listener.start()
+    root_logger.addHandler(_LocalQueueHandler(log_queue))
     
     # App-specific logger
     app_logger = logging.getLogger("backend")
@@ -41,6 +85,12 @@ def setup_logging(log_level=logging.INFO):
     return app_logger
 
 
+def _stop_listener() -> None:
+    """Flush queued records and stop the listener thread at exit."""
+    if _listener is not None:
+        _listener.stop()
+
+
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance for a specific module."""
     return logging.getLogger(name)
@@ -18,6 +18,8 @@ class SourceSignal(BaseModel):
     rating: Optional[float] = Field(None, ge=0.0, le=5.0)  # 0-5 scale or None
     review_count: Optional[int] = Field(None, ge=0)
     sentiment: Optional[Literal["pos", "neg", "mixed", "neutral"]] = None
+    # Keyword sentiment of the snippet, filled in by scoring and kept for re-scoring
+    sentiment_score: Optional[float] = Field(None, ge=-1.0, le=1.0, exclude=True)
     
     class Config:
         json_schema_extra = {
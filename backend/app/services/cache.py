@@ -1,53 +1,171 @@
 """
 Redis cache layer for storing and retrieving company insights.
-Handles serialization/deserialization of Pydantic models.
+Insights are stored as msgpack via typed msgspec mirrors of the Pydantic models,
+so cache hits skip both JSON parsing and Pydantic validation. Large payloads
+(long review snippets) are zlib-compressed behind a one-byte tag.
 """
 
-import json
 import logging
-from typing import Optional
-from datetime import timedelta
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Optional
+from datetime import datetime
+
+import msgspec
+import orjson
 
 try:
-    import redis
-    from redis import Redis
+    import redis.asyncio as aioredis
 except ImportError:
-    redis = None
-    Redis = None
+    aioredis = None
 
-from app.models.company import CompanyInsight
+from app.models.company import CompanyInsight, SourceSignal
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Payload tags: raw msgpack or zlib-compressed msgpack. Neither byte can start
+# an encoded insight, so untagged entries written before tagging still decode.
+_TAG_RAW = b"R"
+_TAG_ZLIB = b"Z"
+_COMPRESS_MIN_BYTES = 4096
+
+
+class _SourceSignalMsg(msgspec.Struct, array_like=True, gc=False):
+    """msgpack mirror of SourceSignal; field order is the wire format."""
+    platform: str
+    url: str
+    title: Optional[str] = None
+    snippet: Optional[str] = None
+    rating: Optional[float] = None
+    review_count: Optional[int] = None
+    sentiment: Optional[str] = None
+    sentiment_score: Optional[float] = None
+
+
+class _CompanyInsightMsg(msgspec.Struct, array_like=True, gc=False):
+    """msgpack mirror of CompanyInsight; field order is the wire format."""
+    name: str
+    canonical_name: str
+    lastCheckedAt: datetime
+    website: Optional[str] = None
+    authenticityScore: Optional[float] = None
+    scamRisk: str = "unknown"
+    companyType: Optional[str] = None
+    flags: list[str] = []
+    sources: list[_SourceSignalMsg] = []
+
+
+_ENCODER = msgspec.msgpack.Encoder()
+_DECODER = msgspec.msgpack.Decoder(_CompanyInsightMsg)
+
+
+def encode_insight(insight: CompanyInsight) -> bytes:
+    """Encode a CompanyInsight to tagged msgpack bytes, compressing large payloads."""
+    blob = _ENCODER.encode(msgspec.convert(insight, _CompanyInsightMsg, from_attributes=True))
+    if len(blob) > _COMPRESS_MIN_BYTES:
+        return _TAG_ZLIB + zlib.compress(blob, 1)
+    return _TAG_RAW + blob
+
+
+def decode_insight(raw: bytes) -> CompanyInsight:
+    """
+    Decode bytes from ``encode_insight`` into a CompanyInsight.
+    
+    The data was validated when it was first built, so the models are
+    rebuilt with model_construct instead of being validated again, unless
+    ``CACHE_VALIDATE_ON_READ`` is set.
+    """
+    tag = raw[:1]
+    if tag == _TAG_ZLIB:
+        raw = zlib.decompress(memoryview(raw)[1:])
+    elif tag == _TAG_RAW:
+        raw = memoryview(raw)[1:]
+    msg = _DECODER.decode(raw)
+    fields = msgspec.structs.asdict(msg)
+    if settings.CACHE_VALIDATE_ON_READ:
+        fields["sources"] = [msgspec.structs.asdict(source) for source in msg.sources]
+        return CompanyInsight.model_validate(fields)
+    fields["sources"] = [
+        SourceSignal.model_construct(**msgspec.structs.asdict(source)) for source in msg.sources
+    ]
+    return CompanyInsight.model_construct(**fields)
+
 
 class CacheService:
-    """Service for caching company insights in Redis."""
+    """
+    Service for caching company insights in Redis.
+    
+    Insights are also kept for a short TTL in a small in-process LRU, so hot
+    companies are served without a Redis round-trip or a decode.
+    """
     
     def __init__(self):
-        """Initialize Redis connection."""
+        """
+        Initialize the async Redis client over a shared connection pool.
+        
+        No connection is made here; the first cache call pings Redis and
+        disables the cache if it is unreachable.
+        """
         self.redis_client = None
         self.enabled = False
+        self._connection_checked = False
+        self._local: OrderedDict[str, tuple[float, CompanyInsight]] = OrderedDict()
         
         try:
-            if redis is None:
+            if aioredis is None:
                 logger.warning("Redis library not installed. Cache disabled.")
                 return
             
-            self.redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
-            # Test connection
-            self.redis_client.ping()
+            # Raw bytes: insights are msgpack, not text
+            pool = aioredis.BlockingConnectionPool.from_url(settings.REDIS_URL, max_connections=32)
+            self.redis_client = aioredis.Redis(connection_pool=pool)
             self.enabled = True
-            logger.info("Redis cache initialized successfully")
         except Exception as e:
             logger.warning(f"Failed to initialize Redis cache: {e}. Cache will be disabled.")
             self.redis_client = None
             self.enabled = False
     
+    async def is_available(self) -> bool:
+        """Whether the cache is usable; pings Redis on first use."""
+        if self.redis_client is None or not self.enabled:
+            return False
+        
+        if not self._connection_checked:
+            self._connection_checked = True
+            try:
+                await self.redis_client.ping()
+                logger.info("Redis cache initialized successfully")
+            except Exception as e:
+                logger.warning(f"Failed to connect to Redis cache: {e}. Cache will be disabled.")
+                self.enabled = False
+        
+        return self.enabled
+    
     def _make_key(self, canonical_name: str) -> str:
         """Generate a cache key from a canonical name."""
         return f"company:{canonical_name}"
     
+    def _local_get(self, canonical_name: str) -> Optional[CompanyInsight]:
+        """Return an unexpired insight from the in-process tier."""
+        entry = self._local.get(canonical_name)
+        if entry is None:
+            return None
+        expires_at, insight = entry
+        if expires_at <= time.monotonic():
+            del self._local[canonical_name]
+            return None
+        self._local.move_to_end(canonical_name)
+        return insight
+    
+    def _local_put(self, canonical_name: str, insight: CompanyInsight) -> None:
+        """Store an insight in the in-process tier, evicting the oldest entry when full."""
+        self._local[canonical_name] = (time.monotonic() + settings.LOCAL_CACHE_TTL_SECONDS, insight)
+        self._local.move_to_end(canonical_name)
+        if len(self._local) > settings.LOCAL_CACHE_MAXSIZE:
+            self._local.popitem(last=False)
+    
     async def get_cached_company(self, canonical_name: str) -> Optional[CompanyInsight]:
         """
         Retrieve a cached company insight.
@@ -58,16 +176,21 @@ class CacheService:
         Returns:
             CompanyInsight if found and valid, None otherwise
         """
-        if not self.enabled or self.redis_client is None:
+        insight = self._local_get(canonical_name)
+        if insight is not None:
+            logger.debug(f"Local cache hit for {canonical_name}")
+            return insight
+        
+        if not await self.is_available():
             return None
         
         try:
             key = self._make_key(canonical_name)
-            cached_data = self.redis_client.get(key)
+            cached_data = await self.redis_client.get(key)
             
             if cached_data:
-                data_dict = json.loads(cached_data)
-                insight = CompanyInsight.model_validate(data_dict)
+                insight = decode_insight(cached_data)
+                self._local_put(canonical_name, insight)
                 logger.debug(f"Cache hit for {canonical_name}")
                 return insight
             
@@ -94,25 +217,141 @@ class CacheService:
         Returns:
             True if successful, False otherwise
         """
-        if not self.enabled or self.redis_client is None:
+        return await self.set_many([(canonical_name, insight, ttl_seconds)])
+    
+    async def set_raw(
+        self,
+        canonical_name: str,
+        data: bytes,
+        ttl_seconds: Optional[int] = None,
+        insight: Optional[CompanyInsight] = None
+    ) -> bool:
+        """
+        Cache an insight that is already msgpack-encoded (see ``encode_insight``).
+        
+        Args:
+            canonical_name: Normalized company name
+            data: Encoded insight bytes
+            ttl_seconds: Time-to-live in seconds (defaults to config value)
+            insight: The decoded insight, if the caller has it, for the in-process tier
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        stored = await self.set_many([(canonical_name, data, ttl_seconds)])
+        if insight is not None:
+            self._local_put(canonical_name, insight)
+        return stored
+    
+    async def set_many(self, items: list[tuple[str, CompanyInsight | bytes, Optional[int]]]) -> bool:
+        """
+        Cache several company insights in one Redis round-trip.
+        
+        The SETs are sent through a single non-transactional pipeline.
+        
+        Args:
+            items: (canonical_name, insight, ttl_seconds) tuples; the insight may
+                be pre-encoded bytes, and a None TTL uses the config value
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        for canonical_name, insight, _ in items:
+            if isinstance(insight, bytes):
+                # Not decoded here; drop any older local copy instead
+                self._local.pop(canonical_name, None)
+            else:
+                self._local_put(canonical_name, insight)
+        
+        if not items or not await self.is_available():
+            return False
+        
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for canonical_name, insight, ttl_seconds in items:
+                    pipe.set(
+                        self._make_key(canonical_name),
+                        insight if isinstance(insight, bytes) else encode_insight(insight),
+                        ex=ttl_seconds or settings.CACHE_TTL_SECONDS
+                    )
+                await pipe.execute()
+            logger.debug(f"Cached {len(items)} companies: {', '.join(name for name, _, _ in items)}")
+            return True
+        except Exception as e:
+            logger.error(f"Error caching companies {[name for name, _, _ in items]}: {e}")
+            return False
+    
+    async def get_cached_companies(self, canonical_names: list[str]) -> list[Optional[CompanyInsight]]:
+        """
+        Retrieve several cached company insights with a single MGET.
+        
+        Args:
+            canonical_names: Normalized company names
+            
+        Returns:
+            CompanyInsight or None for each name, in the same order
+        """
+        results = [self._local_get(name) for name in canonical_names]
+        missing = [i for i, insight in enumerate(results) if insight is None]
+        if not missing or not await self.is_available():
+            return results
+        
+        try:
+            raw_values = await self.redis_client.mget([self._make_key(canonical_names[i]) for i in missing])
+            for i, raw in zip(missing, raw_values):
+                if raw:
+                    results[i] = decode_insight(raw)
+                    self._local_put(canonical_names[i], results[i])
+            return results
+        except Exception as e:
+            logger.error(f"Error retrieving cached companies {canonical_names}: {e}")
+            return results
+    
+    async def get_json(self, key: str) -> Optional[Any]:
+        """
+        Retrieve a JSON value cached under a raw key.
+        
+        Used by connectors to cache intermediate scrape results.
+        
+        Args:
+            key: Full cache key
+            
+        Returns:
+            Decoded value if found, None otherwise
+        """
+        if not await self.is_available():
+            return None
+        
+        try:
+            cached_data = await self.redis_client.get(key)
+            return orjson.loads(cached_data) if cached_data else None
+        except Exception as e:
+            logger.error(f"Error retrieving cached value {key}: {e}")
+            return None
+    
+    async def set_json(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> bool:
+        """
+        Cache a JSON-serializable value under a raw key.
+        
+        Args:
+            key: Full cache key
+            value: JSON-serializable value
+            ttl_seconds: Time-to-live in seconds (defaults to config value)
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not await self.is_available():
             return False
         
         try:
             if ttl_seconds is None:
                 ttl_seconds = settings.CACHE_TTL_SECONDS
             
-            key = self._make_key(canonical_name)
-            data = insight.model_dump_json()
-            
-            self.redis_client.setex(
-                key,
-                timedelta(seconds=ttl_seconds),
-                data
-            )
-            logger.debug(f"Cached company {canonical_name} with TTL {ttl_seconds}s")
+            await self.redis_client.set(key, orjson.dumps(value), ex=ttl_seconds)
             return True
         except Exception as e:
-            logger.error(f"Error caching company {canonical_name}: {e}")
+            logger.error(f"Error caching value {key}: {e}")
             return False
     
     async def invalidate_cache(self, canonical_name: str) -> bool:
@@ -125,17 +364,53 @@ class CacheService:
         Returns:
             True if successful or cache disabled, False on error
         """
-        if not self.enabled or self.redis_client is None:
+        self._local.pop(canonical_name, None)
+        
+        if not await self.is_available():
             return True
         
         try:
             key = self._make_key(canonical_name)
-            self.redis_client.delete(key)
+            await self.redis_client.delete(key)
             logger.debug(f"Invalidated cache for {canonical_name}")
             return True
         except Exception as e:
             logger.error(f"Error invalidating cache for {canonical_name}: {e}")
             return False
+    
+    async def clear_keys(self, pattern: str, batch_size: int = 500) -> int:
+        """
+        Delete every key matching a glob pattern.
+        
+        Walks the keyspace with SCAN and deletes each batch through one
+        pipeline, so unrelated keys in the same Redis DB are left alone.
+        
+        Args:
+            pattern: Redis glob pattern, e.g. ``company:*``
+            batch_size: SCAN COUNT hint and delete batch size
+            
+        Returns:
+            Number of keys deleted
+        """
+        if pattern.startswith("company:"):
+            self._local.clear()
+        
+        if not await self.is_available():
+            return 0
+        
+        deleted = 0
+        cursor = 0
+        while True:
+            cursor, keys = await self.redis_client.scan(cursor, match=pattern, count=batch_size)
+            if keys:
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for key in keys:
+                        pipe.delete(key)
+                    deleted += sum(await pipe.execute())
+            if cursor == 0:
+                break
+        logger.debug(f"Cleared {deleted} keys matching {pattern}")
+        return deleted
 
 
 # Global cache service instance
@@ -148,3 +423,11 @@ def get_cache_service() -> CacheService:
     if _cache_service is None:
         _cache_service = CacheService()
     return _cache_service
+
+
+async def close_cache_service() -> None:
+    """Close the global cache service's Redis pool, if one was created."""
+    global _cache_service
+    if _cache_service is not None and _cache_service.redis_client is not None:
+        await _cache_service.redis_client.aclose()
+    _cache_service = None
@@ -5,28 +5,65 @@ Orchestrates fetching from multiple external sources, caching, and persistence.
 
 import logging
 import asyncio
+import functools
 from typing import Optional
 from datetime import datetime, timedelta
 
 from app.models.company import CompanyInsight, CheckCompanyRequest, SourceSignal
-from app.services.cache import get_cache_service
+from app.services.cache import encode_insight, get_cache_service
 from app.services.repository import get_db_service
 from app.services.scoring import compute_scores
 from app.connectors.reddit_connector import fetch_reddit_signals
 from app.connectors.x_connector import fetch_x_signals
 from app.connectors.glassdoor_connector import fetch_glassdoor_signals
 from app.connectors.ambitionbox_connector import fetch_ambitionbox_signals
-from app.connectors.linkedin_connector import fetch_linkedin_signals
+from app.connectors.linkedin_connector import LINKEDIN_ENABLED, fetch_linkedin_signals
+from app.core.async_cache import SingleFlight
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+def _fetch_ambitionbox(company_name: str, force_refresh: bool = False):
+    # Cached connectors expose the raw coroutine as __wrapped__
+    fetch = fetch_ambitionbox_signals.__wrapped__ if force_refresh else fetch_ambitionbox_signals
+    return fetch(company_name)
+
+
+def _fetch_x(company_name: str, force_refresh: bool = False):
+    return fetch_x_signals(company_name)
+
+
+def _fetch_linkedin(company_name: str, force_refresh: bool = False):
+    return fetch_linkedin_signals(company_name)
+
+
+# Connectors queried on every cache miss, each called as fetch(company_name, force_refresh)
+_CONNECTORS = (
+    ("reddit", fetch_reddit_signals),
+    ("glassdoor", fetch_glassdoor_signals),
+    ("ambitionbox", _fetch_ambitionbox),
+    ("x", _fetch_x),
+) + ((("linkedin", _fetch_linkedin),) if LINKEDIN_ENABLED else ())
+CONNECTOR_NAMES = tuple(name for name, _ in _CONNECTORS)
+CONNECTOR_FETCHERS = tuple(fetch for _, fetch in _CONNECTORS)
+
+# Stale-while-revalidate bookkeeping: companies with a refresh in flight, and
+# strong references so pending refresh tasks are not garbage-collected
+_refreshing: set[str] = set()
+_background_tasks: set[asyncio.Task] = set()
+
+# Connector fan-outs in flight, keyed by (canonical name, force_refresh)
+_builds = SingleFlight()
+
+
+@functools.lru_cache(maxsize=4096)
 def normalize_canonical_name(name: str) -> str:
     """
     Normalize company name to canonical form.
     
-    Converts to lowercase and strips extra whitespace.
+    Converts to lowercase and strips extra whitespace. Memoized, since the
+    same popular names are normalized on every request.
     
     Args:
         name: Original company name
@@ -37,7 +74,11 @@ def normalize_canonical_name(name: str) -> str:
     return name.strip().lower()
 
 
-async def build_company_insight(request: CheckCompanyRequest) -> CompanyInsight:
+async def build_company_insight(
+    request: CheckCompanyRequest,
+    force_refresh: bool = False,
+    canonical_name: Optional[str] = None
+) -> CompanyInsight:
     """
     Build a complete company insight by aggregating signals from multiple sources.
     
@@ -45,20 +86,24 @@ async def build_company_insight(request: CheckCompanyRequest) -> CompanyInsight:
     1. Normalize company name to canonical form
     2. Check Redis cache
     3. If cache miss:
-       a. Check database for stored insight (if not stale)
-       b. If no DB record or stale, fetch from all connectors in parallel
-       c. Aggregate signals and compute scores
-       d. Save to database and cache
+       a. Check database for stored insight; return it if fresh
+       b. If stale, return it and refresh it in a background task
+       c. If no DB record, fetch from all connectors in parallel
+       d. Aggregate signals and compute scores
+       e. Save to database and cache
     4. Return complete CompanyInsight
     
     Args:
         request: CheckCompanyRequest with company details
+        force_refresh: Skip cache, database, and connector caches and re-scrape
+        canonical_name: Pre-normalized name, if the caller already computed it
         
     Returns:
         Populated CompanyInsight object
     """
     
-    canonical_name = normalize_canonical_name(request.name)
+    if canonical_name is None:
+        canonical_name = normalize_canonical_name(request.name)
     logger.info(f"Building insight for: {request.name} (canonical: {canonical_name})")
     
     # Get cache and DB services
@@ -66,27 +111,84 @@ async def build_company_insight(request: CheckCompanyRequest) -> CompanyInsight:
     db_service = get_db_service()
     
     # 1. Check cache
-    cached_insight = await cache_service.get_cached_company(canonical_name)
+    cached_insight = None if force_refresh else await cache_service.get_cached_company(canonical_name)
     if cached_insight:
         logger.info(f"Cache hit for {canonical_name}")
         return cached_insight
     
     # 2. Check database
-    db_insight = await db_service.get_company_by_canonical_name(canonical_name)
+    db_insight = None if force_refresh else await db_service.get_company_by_canonical_name(canonical_name)
     if db_insight:
         # Check if insight is fresh (less than 1 day old)
         age = datetime.utcnow() - db_insight.lastCheckedAt
         if age < timedelta(hours=24):
             logger.info(f"Found fresh DB record for {canonical_name}, re-caching")
-            await cache_service.set_cached_company(canonical_name, db_insight)
+            # Reuse the repository's stored encoding when it keeps one
+            encoded = await db_service.get_encoded(canonical_name)
+            if encoded:
+                await cache_service.set_raw(canonical_name, encoded, insight=db_insight)
+            else:
+                await cache_service.set_cached_company(canonical_name, db_insight)
             return db_insight
         else:
-            logger.info(f"Found stale DB record for {canonical_name}, refreshing")
+            logger.info(f"Found stale DB record for {canonical_name}, refreshing in background")
+            task = asyncio.create_task(_background_refresh(request, canonical_name))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+            return db_insight
+    
+    return await _fetch_and_store(request, canonical_name, force_refresh)
+
+
+async def _background_refresh(request: CheckCompanyRequest, canonical_name: str) -> None:
+    """
+    Rebuild a stale insight off the request path.
+    
+    Concurrent stale hits for the same company share one refresh; later
+    callers return immediately while it is running.
+    """
+    if canonical_name in _refreshing:
+        return
+    
+    _refreshing.add(canonical_name)
+    try:
+        await _fetch_and_store(request, canonical_name)
+    except Exception as e:
+        logger.error(f"Background refresh failed for {canonical_name}: {e}")
+    finally:
+        _refreshing.discard(canonical_name)
+
+
+async def _fetch_and_store(
+    request: CheckCompanyRequest,
+    canonical_name: str,
+    force_refresh: bool = False
+) -> CompanyInsight:
+    """
+    Fetch signals, score them, and save the new insight to the database and cache.
+    
+    Concurrent calls for the same company await a single in-flight fan-out
+    instead of each scraping every connector. Forced refreshes only join other
+    forced refreshes, so they never reuse a build fed by connector caches.
+    """
+    return await _builds.run(
+        (canonical_name, force_refresh), _build_and_store, request, canonical_name, force_refresh
+    )
+
+
+async def _build_and_store(
+    request: CheckCompanyRequest,
+    canonical_name: str,
+    force_refresh: bool = False
+) -> CompanyInsight:
+    """Build a fresh insight from the connectors and persist it."""
+    cache_service = get_cache_service()
+    db_service = get_db_service()
     
     # 3. Fetch signals from all connectors in parallel
     logger.info(f"Fetching signals from external sources for {canonical_name}")
     
-    signals = await fetch_all_signals(request)
+    signals = await fetch_all_signals(request, force_refresh=force_refresh)
     
     # 4. Compute scores and compile insight
     authenticity_score, scam_risk, flags, company_type = compute_scores(
@@ -108,62 +210,64 @@ async def build_company_insight(request: CheckCompanyRequest) -> CompanyInsight:
         lastCheckedAt=datetime.utcnow()
     )
     
-    # 5. Save to database
-    await db_service.save_company_insight(insight)
-    
-    # 6. Cache result
-    await cache_service.set_cached_company(canonical_name, insight)
+    # 5. Encode once, then save to database and cache those bytes concurrently
+    encoded = encode_insight(insight)
+    await asyncio.gather(
+        db_service.save_company_insight(insight, encoded),
+        cache_service.set_raw(canonical_name, encoded, settings.CACHE_TTL_SECONDS, insight=insight)
+    )
     
     logger.info(f"Completed insight for {canonical_name}")
     
     return insight
 
 
-async def fetch_all_signals(request: CheckCompanyRequest) -> list[SourceSignal]:
+async def fetch_all_signals(request: CheckCompanyRequest, force_refresh: bool = False) -> list[SourceSignal]:
     """
     Fetch signals from all available connectors in parallel.
     
-    Handles connector failures gracefully by returning partial results.
+    Handles connector failures gracefully by returning partial results. Each
+    connector gets ``CONNECTOR_TIMEOUT_SECONDS``; one that overruns is
+    cancelled and treated like a failed source.
     
     Args:
         request: Company check request
+        force_refresh: Bypass the in-process connector caches
         
     Returns:
         Aggregated list of SourceSignal objects
     """
     
-    all_signals: list[SourceSignal] = []
-    
-    # Prepare tasks for parallel execution
-    tasks = []
-    
-    # Always include Reddit, Glassdoor, and AmbitionBox
-    tasks.append(("reddit", fetch_reddit_signals(request.name)))
-    tasks.append(("glassdoor", fetch_glassdoor_signals(request.name)))
-    tasks.append(("ambitionbox", fetch_ambitionbox_signals(request.name)))
-    
-    # Include optional connectors
-    tasks.append(("x", fetch_x_signals(request.name)))
-    tasks.append(("linkedin", fetch_linkedin_signals(request.name)))
-    
-    # Execute all tasks concurrently
-    results = await asyncio.gather(
-        *[task[1] for task in tasks],
-        return_exceptions=True
-    )
-    
-    # Process results and handle exceptions
-    for (connector_name, _), result in zip(tasks, results):
-        try:
-            if isinstance(result, Exception):
-                logger.error(f"Error fetching from {connector_name}: {result}")
-            else:
-                all_signals.extend(result)
-                logger.debug(f"Fetched {len(result)} signals from {connector_name}")
-        except Exception as e:
-            logger.error(f"Unexpected error processing {connector_name} result: {e}")
+    # Execute all connectors concurrently; each task handles its own failures
+    async with asyncio.TaskGroup() as tg:
+        tasks = [
+            tg.create_task(_safe_fetch(connector_name, fetch, request.name, force_refresh))
+            for connector_name, fetch in zip(CONNECTOR_NAMES, CONNECTOR_FETCHERS)
+        ]
     
-    return all_signals
+    return [signal for task in tasks for signal in task.result()]
+
+
+async def _safe_fetch(connector_name: str, fetch, company_name: str, force_refresh: bool):
+    """Run one connector under the timeout budget, returning no signals on failure."""
+    timeout = settings.CONNECTOR_TIMEOUT_SECONDS
+    try:
+        result = await asyncio.wait_for(fetch(company_name, force_refresh=force_refresh), timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Timed out fetching from {connector_name} after {timeout}s")
+        return ()
+    except asyncio.CancelledError:
+        # Only a cancellation aimed at this task propagates; a connector's own is a failure
+        if asyncio.current_task().cancelling():
+            raise
+        logger.error(f"Connector {connector_name} was cancelled")
+        return ()
+    except Exception as e:
+        logger.error(f"Error fetching from {connector_name}: {e}")
+        return ()
+    
+    logger.debug(f"Fetched {len(result)} signals from {connector_name}")
+    return result
 
 
 async def refresh_company_insight(canonical_name: str) -> Optional[CompanyInsight]:
@@ -198,6 +302,6 @@ async def refresh_company_insight(canonical_name: str) -> Optional[CompanyInsigh
     await cache_service.invalidate_cache(canonical_name)
     
     # Build fresh insight
-    fresh_insight = await build_company_insight(request)
+    fresh_insight = await build_company_insight(request, force_refresh=True, canonical_name=canonical_name)
     
     return fresh_insight
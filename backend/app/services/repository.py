@@ -4,10 +4,12 @@ Supports Firestore and Postgres; currently stubbed for in-memory storage.
 """
 
 import logging
+import weakref
 from typing import Optional
 from abc import ABC, abstractmethod
 
 from app.models.company import CompanyInsight
+from app.services.cache import encode_insight
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -22,35 +24,51 @@ class Repository(ABC):
         pass
     
     @abstractmethod
-    async def save_company_insight(self, insight: CompanyInsight) -> bool:
-        """Save or update a company insight."""
+    async def save_company_insight(self, insight: CompanyInsight, encoded: Optional[bytes] = None) -> bool:
+        """Save or update a company insight, with its cache encoding if the caller has one."""
         pass
     
     @abstractmethod
     async def delete_company(self, canonical_name: str) -> bool:
         """Delete a company insight."""
         pass
+    
+    async def get_encoded(self, canonical_name: str) -> Optional[bytes]:
+        """Retrieve a company insight already encoded for the cache, if the backend keeps one."""
+        return None
 
 
 class InMemoryRepository(Repository):
     """
     In-memory repository implementation for development and testing.
     Replace with FirestoreRepository or PostgresRepository for production.
+    
+    Each insight is stored with its msgpack encoding so re-caching it in
+    Redis needs no re-serialization.
     """
     
     def __init__(self):
         """Initialize in-memory storage."""
-        self._storage: dict[str, CompanyInsight] = {}
+        self._storage: dict[str, tuple[CompanyInsight, bytes]] = {}
+        _inmem_instances.add(self)
         logger.info("Using in-memory repository (not suitable for production)")
     
     async def get_company_by_canonical_name(self, canonical_name: str) -> Optional[CompanyInsight]:
         """Retrieve a company from memory."""
-        return self._storage.get(canonical_name)
+        entry = self._storage.get(canonical_name)
+        return entry[0] if entry else None
+    
+    async def get_encoded(self, canonical_name: str) -> Optional[bytes]:
+        """Retrieve a company's stored msgpack encoding."""
+        entry = self._storage.get(canonical_name)
+        return entry[1] if entry else None
     
-    async def save_company_insight(self, insight: CompanyInsight) -> bool:
-        """Store a company in memory."""
+    async def save_company_insight(self, insight: CompanyInsight, encoded: Optional[bytes] = None) -> bool:
+        """Store a company in memory, encoding it unless ``encoded`` is given."""
         try:
-            self._storage[insight.canonical_name] = insight
+            if encoded is None:
+                encoded = encode_insight(insight)
+            self._storage[insight.canonical_name] = (insight, encoded)
             logger.debug(f"Saved company {insight.canonical_name} to in-memory storage")
             return True
         except Exception as e:
@@ -69,6 +87,15 @@ class InMemoryRepository(Repository):
             return False
 
 
+# Live in-memory repositories (including stub fallbacks), for admin tooling
+_inmem_instances: "weakref.WeakSet[InMemoryRepository]" = weakref.WeakSet()
+
+
+def iter_inmem_repos() -> list[InMemoryRepository]:
+    """Return every live InMemoryRepository instance."""
+    return list(_inmem_instances)
+
+
 class FirestoreRepository(Repository):
     """
     Firestore repository implementation.
@@ -90,15 +117,19 @@ class FirestoreRepository(Repository):
         # TODO: Implement Firestore retrieval
         return await self._fallback.get_company_by_canonical_name(canonical_name)
     
-    async def save_company_insight(self, insight: CompanyInsight) -> bool:
+    async def save_company_insight(self, insight: CompanyInsight, encoded: Optional[bytes] = None) -> bool:
         """Save to Firestore."""
         # TODO: Implement Firestore save
-        return await self._fallback.save_company_insight(insight)
+        return await self._fallback.save_company_insight(insight, encoded)
     
     async def delete_company(self, canonical_name: str) -> bool:
         """Delete from Firestore."""
         # TODO: Implement Firestore delete
         return await self._fallback.delete_company(canonical_name)
+    
+    async def get_encoded(self, canonical_name: str) -> Optional[bytes]:
+        """Retrieve the cache encoding kept by the fallback store."""
+        return await self._fallback.get_encoded(canonical_name)
 
 
 class PostgresRepository(Repository):
@@ -130,15 +161,19 @@ class PostgresRepository(Repository):
         # TODO: Implement PostgreSQL retrieval
         return await self._fallback.get_company_by_canonical_name(canonical_name)
     
-    async def save_company_insight(self, insight: CompanyInsight) -> bool:
+    async def save_company_insight(self, insight: CompanyInsight, encoded: Optional[bytes] = None) -> bool:
         """Save to PostgreSQL."""
         # TODO: Implement PostgreSQL save
-        return await self._fallback.save_company_insight(insight)
+        return await self._fallback.save_company_insight(insight, encoded)
     
     async def delete_company(self, canonical_name: str) -> bool:
         """Delete from PostgreSQL."""
         # TODO: Implement PostgreSQL delete
         return await self._fallback.delete_company(canonical_name)
+    
+    async def get_encoded(self, canonical_name: str) -> Optional[bytes]:
+        """Retrieve the cache encoding kept by the fallback store."""
+        return await self._fallback.get_encoded(canonical_name)
 
 
 def get_repository() -> Repository:
@@ -3,37 +3,194 @@ Rule-based scoring and heuristic analysis for company authenticity.
 Computes authenticity score, scam risk, company type, and flags.
 """
 
+import bisect
 import logging
+from enum import IntFlag
+from functools import lru_cache
 from typing import Literal
+
+import ahocorasick
+import numpy as np
+
 from app.models.company import SourceSignal
 
 logger = logging.getLogger(__name__)
 
-# Keyword lists for sentiment analysis
-NEGATIVE_KEYWORDS = [
+# Keyword sets for sentiment analysis; matched as whole words
+NEGATIVE_KEYWORDS = frozenset([
     "scam", "fraud", "fake", "unpaid", "no stipend",
     "certificate only", "pay to", "waste of time", "regret",
     "never hire", "avoid", "terrible", "worst", "ripoff",
     "deceptive", "misleading", "false promises"
-]
+])
 
-POSITIVE_KEYWORDS = [
+POSITIVE_KEYWORDS = frozenset([
     "good learning", "helpful", "supportive", "got stipend",
     "valuable", "recommended", "genuine", "legit", "trustworthy",
     "professional", "excellent", "great experience", "worth it"
-]
+])
 
 # Company type indicators
-TRAINING_KEYWORDS = ["training", "course", "bootcamp", "academy", "institute", "coaching"]
-STAFFING_KEYWORDS = ["recruitment", "staffing", "manpower", "placement", "placement agency"]
-EDTECH_KEYWORDS = ["edtech", "online learning", "e-learning", "digital learning", "skill"]
-IT_SERVICES_KEYWORDS = ["it services", "software development", "consulting", "tech solutions"]
+TRAINING_KEYWORDS = frozenset(["training", "course", "bootcamp", "academy", "institute", "coaching"])
+STAFFING_KEYWORDS = frozenset(["recruitment", "staffing", "manpower", "placement", "placement agency"])
+EDTECH_KEYWORDS = frozenset(["edtech", "online learning", "e-learning", "digital learning", "skill"])
+IT_SERVICES_KEYWORDS = frozenset(["it services", "software development", "consulting", "tech solutions"])
 
 # Scam risk indicators
-SCAM_INDICATORS = [
+SCAM_INDICATORS = frozenset([
     "no linkedin page", "course marketed as internship", "hidden fees",
     "no company verification", "high negative sentiment", "no online presence"
-]
+])
+
+class ScoreFlag(IntFlag):
+    """Warning flags raised while scoring, carried as a bitmask."""
+    NO_SIGNALS = 1
+    LIMITED_SIGNALS = 2
+    NO_LINKEDIN = 4
+    NO_GLASSDOOR = 8
+    NO_WEBSITE = 16
+    COURSE_AS_INTERNSHIP = 32
+
+
+# Public flag strings, in the order they are reported
+FLAG_LABELS = {
+    ScoreFlag.NO_SIGNALS: "no external signals found",
+    ScoreFlag.LIMITED_SIGNALS: "limited external signals",
+    ScoreFlag.NO_LINKEDIN: "no_linkedin_page",
+    ScoreFlag.NO_GLASSDOOR: "no_glassdoor_presence",
+    ScoreFlag.NO_WEBSITE: "no_website_provided",
+    ScoreFlag.COURSE_AS_INTERNSHIP: "course_marketed_as_internship",
+}
+
+# Flags that force a high scam risk regardless of score
+CRITICAL_FLAGS = ScoreFlag.COURSE_AS_INTERNSHIP | ScoreFlag.NO_SIGNALS
+
+# Score thresholds and the risk level at or above each (below the first: "unknown")
+_RISK_THRESHOLDS = (25, 50, 75)
+_RISK_LEVELS = ("unknown", "high", "medium", "low")
+
+# Below this many values, NumPy's call overhead outweighs its vectorized reductions
+_NUMPY_MIN_VALUES = 32
+
+# Snippet terms behind the "course marketed as internship" flag
+COURSE_TERMS = frozenset(["course", "training"])
+INTERNSHIP_TERMS = frozenset(["internship", "placement"])
+
+# Inflected and derived forms counted as their base keyword, since keywords
+# only match whole words ("scams" would otherwise not count as "scam")
+KEYWORD_INFLECTIONS = {
+    "scam": ("scams", "scammed", "scammer", "scammers", "scamming", "scammy"),
+    "fraud": ("frauds", "fraudulent", "fraudster", "fraudsters"),
+    "fake": ("fakes", "faked"),
+    "regret": ("regrets", "regretted", "regretting"),
+    "avoid": ("avoids", "avoided", "avoiding"),
+    "ripoff": ("ripoffs",),
+    "legit": ("legitimate",),
+    "genuine": ("genuinely",),
+    "professional": ("professionals", "professionally"),
+    "training": ("trainings",),
+    "course": ("courses",),
+    "bootcamp": ("bootcamps",),
+    "academy": ("academies",),
+    "institute": ("institutes",),
+    "placement": ("placements",),
+    "placement agency": ("placement agencies",),
+    "recruitment": ("recruitments",),
+    "skill": ("skills", "upskill", "upskilling"),
+    "edtech": ("edtechs",),
+    "internship": ("internships",),
+}
+
+
+def _build_keyword_automaton() -> ahocorasick.Automaton:
+    """
+    Build one Aho-Corasick automaton over every keyword list.
+    
+    Each keyword maps to the set of categories it counts toward, since some
+    (e.g. "training", "placement") appear in more than one list. Forms from
+    KEYWORD_INFLECTIONS are added under their base keyword.
+    """
+    categories: dict[str, set[str]] = {}
+    for category, keywords in (
+        ("neg", NEGATIVE_KEYWORDS),
+        ("pos", POSITIVE_KEYWORDS),
+        ("training", TRAINING_KEYWORDS),
+        ("edtech", EDTECH_KEYWORDS),
+        ("staffing", STAFFING_KEYWORDS),
+        ("it_services", IT_SERVICES_KEYWORDS),
+        ("course", COURSE_TERMS),
+        ("internship", INTERNSHIP_TERMS),
+    ):
+        for kw in keywords:
+            categories.setdefault(kw, set()).add(category)
+    
+    automaton = ahocorasick.Automaton()
+    for kw, cats in categories.items():
+        cats = frozenset(cats)
+        for form in (kw, *KEYWORD_INFLECTIONS.get(kw, ())):
+            automaton.add_word(form, (kw, len(form), cats))
+    automaton.make_automaton()
+    return automaton
+
+
+KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+
+def _is_word_char(ch: str) -> bool:
+    """Whether a character counts as part of a word, as for regex ``\\w``."""
+    return ch.isalnum() or ch == "_"
+
+
+def _keyword_counts(text_lower: str) -> dict[str, int]:
+    """
+    Count distinct keyword hits per category in a single pass over the text.
+    
+    Only whole-word matches of a keyword or one of its listed inflections
+    count ("scam" matches "scams" but not "scamper"), and a keyword occurring
+    several times, in any form, is counted once.
+    """
+    seen: set[str] = set()
+    counts: dict[str, int] = {}
+    last = len(text_lower) - 1
+    for end, (kw, length, cats) in KEYWORD_AUTOMATON.iter(text_lower):
+        if kw in seen:
+            continue
+        start = end - length + 1
+        if (start > 0 and _is_word_char(text_lower[start - 1])) or (
+            end < last and _is_word_char(text_lower[end + 1])
+        ):
+            continue
+        seen.add(kw)
+        for cat in cats:
+            counts[cat] = counts.get(cat, 0) + 1
+    return counts
+
+
+def _sentiment_from_counts(counts: dict[str, int]) -> float:
+    """Turn positive/negative keyword counts into a -1.0 to 1.0 score."""
+    positive_count = counts.get("pos", 0)
+    negative_count = counts.get("neg", 0)
+    
+    total = positive_count + negative_count
+    if total == 0:
+        return 0.0
+    
+    return (positive_count - negative_count) / total
+
+
+@lru_cache(maxsize=8192)
+def _score_snippet(text_lower: str) -> tuple[float, bool]:
+    """
+    Score one lowercased snippet.
+    
+    Memoized, since Reddit threads and review boilerplate repeat the same
+    snippets across requests.
+    
+    Returns:
+        Tuple of (sentiment, mentions both course and internship terms)
+    """
+    counts = _keyword_counts(text_lower)
+    return _sentiment_from_counts(counts), "course" in counts and "internship" in counts
 
 
 def compute_scores(
@@ -62,18 +219,26 @@ def compute_scores(
         Tuple of (authenticityScore, scamRisk, flags, companyType)
     """
     
-    flags = []
+    flags = ScoreFlag(0)
     sentiment_scores = []
     ratings = []
     signal_count = 0
+    lowered_snippets: list[str] = []
+    platforms: set[str] = set()
     
     # Analyze each signal
     for signal in signals:
         signal_count += 1
+        platforms.add(signal.platform)
         
-        # Extract sentiment from snippet
+        # Extract sentiment from snippet, reusing a score from an earlier pass
         if signal.snippet:
-            sentiment = analyze_sentiment(signal.snippet)
+            text_lower = signal.snippet.lower()
+            lowered_snippets.append(text_lower)
+            sentiment = signal.sentiment_score
+            if sentiment is None:
+                sentiment = _score_snippet(text_lower)[0]
+                signal.sentiment_score = sentiment
             sentiment_scores.append(sentiment)
         
         # Collect ratings from review platforms
@@ -85,59 +250,61 @@ def compute_scores(
     
     # Adjust based on sentiment
     if sentiment_scores:
-        pos_count = sum(1 for s in sentiment_scores if s > 0)
-        neg_count = sum(1 for s in sentiment_scores if s < 0)
+        if len(sentiment_scores) >= _NUMPY_MIN_VALUES:
+            scores = np.fromiter(sentiment_scores, dtype=np.float64, count=len(sentiment_scores))
+            pos_count = int(np.count_nonzero(scores > 0))
+            neg_count = int(np.count_nonzero(scores < 0))
+        else:
+            pos_count = sum(1 for s in sentiment_scores if s > 0)
+            neg_count = sum(1 for s in sentiment_scores if s < 0)
         
         sentiment_ratio = (pos_count - neg_count) / len(sentiment_scores)
         authenticity_score += sentiment_ratio * 25  # ±25 points for sentiment
     
     # Adjust based on platform ratings
     if ratings:
-        avg_rating = sum(ratings) / len(ratings)
+        if len(ratings) >= _NUMPY_MIN_VALUES:
+            avg_rating = float(np.fromiter(ratings, dtype=np.float64, count=len(ratings)).mean())
+        else:
+            avg_rating = sum(ratings) / len(ratings)
         rating_score = (avg_rating / 5.0) * 25  # Normalize 0-5 to 0-25
         authenticity_score += rating_score
     
     # Penalty for lack of signals
     if signal_count == 0:
-        flags.append("no external signals found")
+        flags |= ScoreFlag.NO_SIGNALS
         authenticity_score = 20.0  # Low confidence
     elif signal_count < 3:
-        flags.append("limited external signals")
+        flags |= ScoreFlag.LIMITED_SIGNALS
         authenticity_score *= 0.9  # 10% penalty
     
     # Check for specific red flags
-    has_glassdoor = any(s.platform == "glassdoor" for s in signals)
-    has_linkedin = any(s.platform == "linkedin" for s in signals)
-    has_reddit = any(s.platform == "reddit" for s in signals)
+    has_glassdoor = "glassdoor" in platforms
+    has_linkedin = "linkedin" in platforms
+    has_reddit = "reddit" in platforms
     
     if not has_linkedin:
-        flags.append("no_linkedin_page")
+        flags |= ScoreFlag.NO_LINKEDIN
     
     if not has_glassdoor:
-        flags.append("no_glassdoor_presence")
+        flags |= ScoreFlag.NO_GLASSDOOR
     
     # Check if website exists and is responsive
     if not website:
-        flags.append("no_website_provided")
+        flags |= ScoreFlag.NO_WEBSITE
     
     # Infer company type
-    company_type = infer_company_type(signals, company_name)
+    company_type = infer_company_type(signals, company_name, lowered_snippets)
     
     # Apply type-specific flags
     if company_type == "training" or company_type == "edtech":
         # Check for "course marketed as internship" pattern
-        for signal in signals:
-            if signal.snippet and any(
-                kw in signal.snippet.lower() for kw in ["course", "training"]
-            ):
-                if signal.snippet and any(
-                    kw in signal.snippet.lower() for kw in ["internship", "placement"]
-                ):
-                    flags.append("course_marketed_as_internship")
-                    break
+        if any(_score_snippet(text_lower)[1] for text_lower in lowered_snippets):
+            flags |= ScoreFlag.COURSE_AS_INTERNSHIP
     
     # Determine scam risk
     scam_risk = determine_scam_risk(authenticity_score, flags)
+    flag_labels = flags_to_labels(flags)
     
     # Clamp authenticity score to 0-100 range
     authenticity_score = max(0.0, min(100.0, authenticity_score))
@@ -145,88 +312,81 @@ def compute_scores(
     logger.info(
         f"Computed scores for {company_name}: "
         f"authenticity={authenticity_score:.1f}, risk={scam_risk}, "
-        f"type={company_type}, flags={flags}"
+        f"type={company_type}, flags={flag_labels}"
     )
     
-    return authenticity_score, scam_risk, flags, company_type
+    return authenticity_score, scam_risk, flag_labels, company_type
 
 
-def analyze_sentiment(text: str) -> float:
+def flags_to_labels(flags: int) -> list[str]:
+    """Convert a ScoreFlag bitmask to the public flag strings."""
+    return [label for flag, label in FLAG_LABELS.items() if flags & flag]
+
+
+def analyze_sentiment(text_lower: str) -> float:
     """
-    Analyze sentiment of a text snippet using keyword matching.
+    Analyze sentiment of an already-lowercased text snippet using keyword matching.
     
     Returns:
         Sentiment score: -1.0 (negative) to 1.0 (positive), 0 = neutral
     """
-    text_lower = text.lower()
-    
-    positive_count = sum(1 for kw in POSITIVE_KEYWORDS if kw in text_lower)
-    negative_count = sum(1 for kw in NEGATIVE_KEYWORDS if kw in text_lower)
-    
-    total = positive_count + negative_count
-    if total == 0:
-        return 0.0
-    
-    return (positive_count - negative_count) / total
+    return _score_snippet(text_lower)[0]
 
 
-def infer_company_type(signals: list[SourceSignal], company_name: str) -> str | None:
+def infer_company_type(
+    signals: list[SourceSignal],
+    company_name: str,
+    lowered_snippets: list[str] | None = None
+) -> str | None:
     """
     Infer company type from signals and company name keywords.
     
+    Args:
+        signals: List of SourceSignal objects from external sources
+        company_name: Original company name
+        lowered_snippets: Signal snippets already lowercased by the caller;
+            derived from ``signals`` when omitted
+    
     Returns:
         Company type string: "training", "edtech", "staffing", "it_services", or None
     """
+    if lowered_snippets is None:
+        lowered_snippets = [s.snippet.lower() for s in signals if s.snippet]
+    
     # Combine text from signals and company name
-    combined_text = (company_name + " " + " ".join(
-        s.snippet or "" for s in signals if s.snippet
-    )).lower()
+    combined_text = company_name.lower() + " " + " ".join(lowered_snippets)
+    counts = _keyword_counts(combined_text)
     
     # Check keywords in order of specificity
-    if any(kw in combined_text for kw in TRAINING_KEYWORDS):
-        return "training"
-    if any(kw in combined_text for kw in EDTECH_KEYWORDS):
-        return "edtech"
-    if any(kw in combined_text for kw in STAFFING_KEYWORDS):
-        return "staffing"
-    if any(kw in combined_text for kw in IT_SERVICES_KEYWORDS):
-        return "it_services"
+    for company_type in ("training", "edtech", "staffing", "it_services"):
+        if company_type in counts:
+            return company_type
     
     return None
 
 
 def determine_scam_risk(
     authenticity_score: float,
-    flags: list[str]
+    flags: int
 ) -> Literal["low", "medium", "high", "unknown"]:
     """
     Determine scam risk level based on authenticity score and flags.
     
     Args:
         authenticity_score: Score from 0-100
-        flags: List of warning flags
+        flags: ScoreFlag bitmask of warning flags
         
     Returns:
         Risk level: "low", "medium", "high", or "unknown"
     """
     # Check for critical scam indicators
-    critical_flags = [
-        "course_marketed_as_internship",
-        "no_external_signals_found"
-    ]
-    
-    if any(flag in flags for flag in critical_flags):
+    if flags & CRITICAL_FLAGS:
         return "high"
     
     # Score-based thresholds
-    if authenticity_score >= 75:
-        return "low"
-    elif authenticity_score >= 50:
-        return "medium"
-    elif authenticity_score >= 25:
+    level = _RISK_LEVELS[bisect.bisect_right(_RISK_THRESHOLDS, authenticity_score)]
+    
+    # Very low score with multiple flags = high risk
+    if level == "unknown" and flags.bit_count() >= 3:
         return "high"
-    else:
-        # Very low score with multiple flags = high risk
-        if len(flags) >= 3:
-            return "high"
-        return "unknown"
+    return level
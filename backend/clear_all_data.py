@@ -16,35 +16,33 @@ async def clear_everything():
     
     # Import here to avoid issues
     try:
-        from app.services import cache
-        from app.services.repository import InMemoryRepository
+        from app.services import cache as cache_module
+        from app.services import repository as repo_module
+        
+        cache = cache_module.get_cache_service()
         
-        # Clear Redis cache
-        if hasattr(cache, 'redis_client') and cache.redis_client:
+        # Clear Redis cache (insights and connector scrape caches only)
+        if await cache.is_available():
             try:
-                await cache.redis_client.flushdb()
-                print("✅ Redis cache cleared")
+                deleted = 0
+                for pattern in ("company:*", "reddit:*"):
+                    deleted += await cache.clear_keys(pattern)
+                print(f"✅ Redis cache cleared ({deleted} keys)")
             except Exception as e:
                 print(f"⚠️  Redis clear failed: {e}")
         else:
             print("⚠️  Redis not connected (using in-memory cache)")
         
-        # Clear in-memory cache if exists
-        if hasattr(cache, '_cache_storage'):
-            cache._cache_storage.clear()
-            print("✅ In-memory cache cleared")
+        # Clear the process-local insight cache in front of Redis
+        cache._local.clear()
+        print("✅ In-memory cache cleared")
         
         # Clear in-memory database
-        # The repository is likely instantiated elsewhere, so we need to access the global instance
-        from app.services import repository as repo_module
-        
-        # Try to find the repository instance
-        for attr_name in dir(repo_module):
-            attr = getattr(repo_module, attr_name)
-            if isinstance(attr, InMemoryRepository) and hasattr(attr, '_storage'):
-                attr._storage.clear()
-                print("✅ In-memory database cleared")
-                break
+        repos = repo_module.iter_inmem_repos()
+        for repo in repos:
+            repo._storage.clear()
+        if repos:
+            print("✅ In-memory database cleared")
         else:
             print("ℹ️  In-memory database not found or already empty")
         
@@ -61,12 +59,13 @@ async def clear_specific_company(canonical_name: str):
     print(f"🧹 Clearing data for: {canonical_name}\n")
     
     try:
-        from app.services import cache
-        from app.services.repository import InMemoryRepository
+        from app.services import cache as cache_module
         from app.services import repository as repo_module
         
+        cache = cache_module.get_cache_service()
+        
         # Clear from Redis
-        if hasattr(cache, 'redis_client') and cache.redis_client:
+        if await cache.is_available():
             try:
                 key = f"company:{canonical_name}"
                 deleted = await cache.redis_client.delete(key)
@@ -77,23 +76,17 @@ async def clear_specific_company(canonical_name: str):
             except Exception as e:
                 print(f"⚠️  Redis clear failed: {e}")
         
-        # Clear from in-memory cache
-        if hasattr(cache, '_cache_storage'):
-            cache_key = f"company:{canonical_name}"
-            if cache_key in cache._cache_storage:
-                del cache._cache_storage[cache_key]
-                print(f"✅ Cleared from in-memory cache: {canonical_name}")
+        # Clear from the process-local insight cache
+        if cache._local.pop(canonical_name, None) is not None:
+            print(f"✅ Cleared from in-memory cache: {canonical_name}")
         
         # Clear from in-memory database
-        for attr_name in dir(repo_module):
-            attr = getattr(repo_module, attr_name)
-            if isinstance(attr, InMemoryRepository) and hasattr(attr, '_storage'):
-                if canonical_name in attr._storage:
-                    del attr._storage[canonical_name]
-                    print(f"✅ Cleared from database: {canonical_name}")
-                else:
-                    print(f"ℹ️  Not found in database: {canonical_name}")
-                break
+        repos = repo_module.iter_inmem_repos()
+        if repos:
+            if any([repo._storage.pop(canonical_name, None) is not None for repo in repos]):
+                print(f"✅ Cleared from database: {canonical_name}")
+            else:
+                print(f"ℹ️  Not found in database: {canonical_name}")
         
         print(f"\n✨ Data cleared for {canonical_name}! Fresh scraping will happen on next request.\n")
         
@@ -3,70 +3,135 @@ Know Your Company - Company Authenticity Checker Backend
 FastAPI application entry point with CORS configuration
 """
 
+import hashlib
 import logging
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
+
+import orjson
+from fastapi import FastAPI, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from app.core.config import settings
+from app.core.cors import PureASGICORSMiddleware
 from app.core.logging import setup_logging
+from app.core.http import get_http_client, close_http_client
+from app.services.cache import close_cache_service
 from app.api.routes import router
 
 # Configure structured logging
 logger = setup_logging(logging.INFO)
 
+# Lifecycle records carry the app name and version as structured fields
+_app_logger = logging.LoggerAdapter(logger, {"app": settings.APP_NAME, "version": settings.APP_VERSION})
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize shared services on startup and release them on shutdown."""
+    _app_logger.info("Starting | debug=%s | cors_origins=%d", settings.DEBUG, len(settings.CORS_ORIGINS))
+    app.state.http = get_http_client()
+    if app.openapi_url:
+        # Build the schema at boot; app.openapi() caches it on app.openapi_schema
+        app.openapi()
+    
+    yield
+    
+    _app_logger.info("Shutting down application")
+    await close_http_client()
+    await close_cache_service()
+
+
+# Interactive docs and the OpenAPI schema are only served in debug mode
+DOCS_URL = "/docs" if settings.DEBUG else None
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="Aggregates signals from multiple sources to check company authenticity",
-    docs_url="/docs",
-    redoc_url="/redoc"
+    docs_url=DOCS_URL,
+    redoc_url=None,
+    openapi_url="/openapi.json" if settings.DEBUG else None,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS
 app.add_middleware(
-    CORSMiddleware,
+    PureASGICORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
     allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
     allow_methods=settings.CORS_ALLOW_METHODS,
     allow_headers=settings.CORS_ALLOW_HEADERS,
 )
 
+# Compress JSON responses; added after CORS so it wraps the CORS-decorated response
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
+
 # Include API routes
 app.include_router(router)
 
 
-@app.get("/")
-async def root():
-    """Root endpoint with API info."""
-    return {
-        "name": settings.APP_NAME,
-        "version": settings.APP_VERSION,
-        "docs": "/docs",
-        "health": "/api/health"
-    }
+# The root payload only depends on settings, so it is serialized once
+_ROOT_BODY = orjson.dumps({
+    "name": settings.APP_NAME,
+    "version": settings.APP_VERSION,
+    "docs": DOCS_URL,
+    "health": "/api/health"
+})
+_ROOT_HEADERS = {
+    "etag": '"' + hashlib.sha1(_ROOT_BODY).hexdigest()[:16] + '"',
+    "cache-control": "public, max-age=3600",
+}
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services on startup."""
-    logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
-    logger.info(f"Debug mode: {settings.DEBUG}")
-    logger.info(f"CORS origins: {settings.CORS_ORIGINS}")
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header value matches an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(",")
+    )
 
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown."""
-    logger.info("Shutting down application")
+@app.get("/")
+async def root(request: Request):
+    """Root endpoint with API info; answers 304 when the client's ETag matches."""
+    if _etag_matches(request.headers.get("if-none-match"), _ROOT_HEADERS["etag"]):
+        return Response(status_code=304, headers=_ROOT_HEADERS)
+    return Response(content=_ROOT_BODY, media_type="application/json", headers=_ROOT_HEADERS)
 
 
 if __name__ == "__main__":
+    import asyncio
+    import sys
     import uvicorn
     
-    uvicorn.run(
-        "main:app",
+    options = dict(
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
-        log_level="info"
-    )
\ No newline at end of file
+        workers=1 if settings.DEBUG else settings.WORKERS,
+        loop="auto" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        proxy_headers=True,
+        forwarded_allow_ips=settings.FORWARDED_ALLOW_IPS,
+        log_level="info" if settings.DEBUG else "warning",
+        access_log=settings.DEBUG
+    )
+    
+    if options["reload"] or options["workers"] > 1:
+        # Reload and multi-worker runs need uvicorn's supervisor processes
+        uvicorn.run("main:app", **options)
+    else:
+        # Single process: serve on a loop we create ourselves
+        server = uvicorn.Server(uvicorn.Config("main:app", **options))
+        if sys.platform == "win32":
+            loop_factory = None
+        else:
+            import uvloop
+            loop_factory = uvloop.new_event_loop
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(server.serve())
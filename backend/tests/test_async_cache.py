@@ -0,0 +1,122 @@
+"""
+Tests for the in-process async TTL cache and its single-flight coalescing.
+"""
+
+import asyncio
+import gc
+
+import pytest
+
+from app.core.async_cache import SingleFlight, async_ttl_cache
+
+
+def test_concurrent_misses_share_one_call():
+    calls = 0
+
+    @async_ttl_cache(ttl=60)
+    async def fetch(key):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return [key]
+
+    async def main():
+        results = await asyncio.gather(*(fetch("a") for _ in range(5)))
+        assert results == [["a"]] * 5
+        assert await fetch("a") == ["a"]
+
+    asyncio.run(main())
+    assert calls == 1
+
+
+def test_falsy_results_are_not_cached():
+    calls = 0
+
+    @async_ttl_cache(ttl=60)
+    async def fetch(key):
+        nonlocal calls
+        calls += 1
+        return []
+
+    async def main():
+        await fetch("a")
+        await fetch("a")
+
+    asyncio.run(main())
+    assert calls == 2
+
+
+def test_owner_cancellation_does_not_cancel_waiters():
+    calls = 0
+
+    @async_ttl_cache(ttl=60)
+    async def fetch(key):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return [key]
+
+    async def main():
+        owner = asyncio.create_task(asyncio.wait_for(fetch("a"), timeout=0.01))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(fetch("a"))
+
+        with pytest.raises(asyncio.TimeoutError):
+            await owner
+        assert await waiter == ["a"]
+        assert not waiter.cancelled()
+
+    asyncio.run(main())
+    # The waiter retried the call after the owner was cancelled
+    assert calls == 2
+
+
+def test_waiter_cancellation_does_not_cancel_owner():
+    @async_ttl_cache(ttl=60)
+    async def fetch(key):
+        await asyncio.sleep(0.02)
+        return [key]
+
+    async def main():
+        owner = asyncio.create_task(fetch("a"))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(fetch("a"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert await owner == ["a"]
+
+    asyncio.run(main())
+
+
+def test_exceptions_reach_waiters():
+    @async_ttl_cache(ttl=60)
+    async def fetch(key):
+        await asyncio.sleep(0.01)
+        raise ValueError(key)
+
+    async def main():
+        results = await asyncio.gather(fetch("a"), fetch("a"), return_exceptions=True)
+        assert [type(r) for r in results] == [ValueError, ValueError]
+
+    asyncio.run(main())
+
+
+def test_exception_without_waiters_is_not_reported_unretrieved():
+    reported = []
+    flight = SingleFlight()
+
+    async def fail():
+        raise ValueError("boom")
+
+    async def main():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, ctx: reported.append(ctx))
+        with pytest.raises(ValueError):
+            await flight.run("a", fail)
+        gc.collect()
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert reported == []
@@ -0,0 +1,66 @@
+"""
+Tests for the msgpack insight codec used by the Redis cache.
+"""
+
+from datetime import datetime
+
+from app.models.company import CompanyInsight, SourceSignal
+from app.services import cache
+
+
+def _insight(snippet: str = "Good place to work") -> CompanyInsight:
+    return CompanyInsight(
+        name="Acme Corp",
+        canonical_name="acme corp",
+        website="https://acme.example",
+        authenticityScore=72.5,
+        scamRisk="low",
+        companyType="it_services",
+        flags=["no_linkedin_page"],
+        sources=[
+            SourceSignal(
+                platform="glassdoor",
+                url="https://www.glassdoor.com/Overview/Working-at-Acme-EI_IE1.htm",
+                title="Acme Overview",
+                snippet=snippet,
+                rating=4.1,
+                review_count=120,
+                sentiment="pos",
+                sentiment_score=0.5,
+            ),
+            SourceSignal(platform="reddit", url="https://reddit.com/r/x/1"),
+        ],
+        lastCheckedAt=datetime(2025, 12, 9, 10, 0, 0),
+    )
+
+
+def test_round_trip():
+    insight = _insight()
+    encoded = cache.encode_insight(insight)
+    assert encoded[:1] == cache._TAG_RAW
+
+    decoded = cache.decode_insight(encoded)
+    assert decoded == insight
+    assert decoded.sources[0].sentiment_score == 0.5
+
+
+def test_large_payloads_are_compressed():
+    insight = _insight(snippet="long review text " * 1000)
+    encoded = cache.encode_insight(insight)
+    assert encoded[:1] == cache._TAG_ZLIB
+    assert len(encoded) < len(insight.sources[0].snippet)
+    assert cache.decode_insight(encoded) == insight
+
+
+def test_untagged_legacy_entries_decode():
+    insight = _insight()
+    legacy = cache.encode_insight(insight)[1:]
+    assert cache.decode_insight(legacy) == insight
+
+
+def test_validate_on_read(monkeypatch):
+    monkeypatch.setattr(cache.settings, "CACHE_VALIDATE_ON_READ", True)
+    insight = _insight()
+    decoded = cache.decode_insight(cache.encode_insight(insight))
+    assert decoded == insight
+    assert isinstance(decoded.sources[0], SourceSignal)
@@ -0,0 +1,141 @@
+"""
+Tests for the connector fan-out in the company aggregator.
+"""
+
+import asyncio
+
+import pytest
+
+from app.models.company import CheckCompanyRequest, SourceSignal
+from app.services import cache, company_aggregator, repository
+
+
+def _use_connectors(monkeypatch, **connectors):
+    monkeypatch.setattr(company_aggregator, "CONNECTOR_NAMES", tuple(connectors))
+    monkeypatch.setattr(company_aggregator, "CONNECTOR_FETCHERS", tuple(connectors.values()))
+
+
+async def _ok(company_name, force_refresh=False):
+    return ["signal"]
+
+
+async def _cancelled(company_name, force_refresh=False):
+    raise asyncio.CancelledError()
+
+
+async def _failing(company_name, force_refresh=False):
+    raise RuntimeError("blocked")
+
+
+async def _slow(company_name, force_refresh=False):
+    await asyncio.sleep(10)
+    return ["late"]
+
+
+def test_failed_sources_are_skipped(monkeypatch):
+    _use_connectors(monkeypatch, ok=_ok, cancelled=_cancelled, failing=_failing)
+    signals = asyncio.run(company_aggregator.fetch_all_signals(CheckCompanyRequest(name="Acme")))
+    assert signals == ["signal"]
+
+
+def test_slow_sources_time_out(monkeypatch):
+    monkeypatch.setattr(company_aggregator.settings, "CONNECTOR_TIMEOUT_SECONDS", 0.01)
+    _use_connectors(monkeypatch, ok=_ok, slow=_slow)
+    signals = asyncio.run(company_aggregator.fetch_all_signals(CheckCompanyRequest(name="Acme")))
+    assert signals == ["signal"]
+
+
+def test_outer_cancellation_propagates(monkeypatch):
+    _use_connectors(monkeypatch, slow=_slow)
+
+    async def main():
+        task = asyncio.create_task(company_aggregator.fetch_all_signals(CheckCompanyRequest(name="Acme")))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+
+
+class _FakePipeline:
+    def __init__(self, store):
+        self.store = store
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    async def execute(self):
+        pass
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self.store)
+
+
+@pytest.fixture
+def services(monkeypatch):
+    """Fresh cache service on a fake Redis and a fresh in-memory repository."""
+    cache_service = cache.CacheService()
+    cache_service.redis_client = _FakeRedis()
+    cache_service.enabled = True
+    cache_service._connection_checked = True
+    db_service = repository.InMemoryRepository()
+    monkeypatch.setattr(company_aggregator, "get_cache_service", lambda: cache_service)
+    monkeypatch.setattr(company_aggregator, "get_db_service", lambda: db_service)
+    return cache_service, db_service
+
+
+@pytest.fixture
+def encode_calls(monkeypatch):
+    """Count encode_insight calls made by the aggregator, cache and repository."""
+    calls = []
+    original = cache.encode_insight
+
+    def counting(insight):
+        calls.append(insight.canonical_name)
+        return original(insight)
+
+    for module in (company_aggregator, cache, repository):
+        monkeypatch.setattr(module, "encode_insight", counting)
+    return calls
+
+
+async def _glassdoor(company_name, force_refresh=False):
+    return [SourceSignal(platform="glassdoor", url="https://example.com", snippet="helpful", rating=4.0)]
+
+
+def test_fresh_build_is_encoded_once(monkeypatch, services, encode_calls):
+    cache_service, db_service = services
+    _use_connectors(monkeypatch, glassdoor=_glassdoor)
+
+    insight = asyncio.run(company_aggregator.build_company_insight(CheckCompanyRequest(name="Acme")))
+
+    assert encode_calls == ["acme"]
+    stored = cache_service.redis_client.store[cache_service._make_key("acme")]
+    assert stored == asyncio.run(db_service.get_encoded("acme"))
+    assert cache.decode_insight(stored) == insight
+
+
+def test_fresh_db_hit_is_not_re_encoded(monkeypatch, services, encode_calls):
+    cache_service, db_service = services
+    _use_connectors(monkeypatch, glassdoor=_glassdoor)
+    asyncio.run(company_aggregator.build_company_insight(CheckCompanyRequest(name="Acme")))
+    cache_service.redis_client.store.clear()
+    cache_service._local.clear()
+    encode_calls.clear()
+
+    asyncio.run(company_aggregator.build_company_insight(CheckCompanyRequest(name="Acme")))
+
+    assert encode_calls == []
+    assert cache_service.redis_client.store[cache_service._make_key("acme")] == asyncio.run(db_service.get_encoded("acme"))
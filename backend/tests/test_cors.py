@@ -0,0 +1,89 @@
+"""
+Differential tests: PureASGICORSMiddleware must answer exactly like Starlette's CORSMiddleware.
+"""
+
+import asyncio
+import itertools
+
+import pytest
+from starlette.applications import Starlette
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.config import settings
+from app.core.cors import PureASGICORSMiddleware
+
+CONFIGS = [
+    dict(
+        allow_origins=settings.CORS_ORIGINS,
+        allow_methods=settings.CORS_ALLOW_METHODS,
+        allow_headers=settings.CORS_ALLOW_HEADERS,
+        allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
+    ),
+    dict(allow_origins=["http://a.com", "http://b.com"], allow_methods=["*"], allow_headers=["*"], allow_credentials=True),
+    dict(allow_origins=["*"], allow_methods=["GET", "POST"], allow_headers=["X-Foo"], allow_credentials=False),
+    dict(allow_origins=["*"], allow_methods=["*"], allow_headers=[], allow_credentials=True),
+    dict(allow_origins=["http://a.com"], allow_methods=["GET"], allow_headers=["content-type", "authorization"]),
+]
+
+REQUESTS = list(itertools.product(
+    [None, "http://a.com", "http://localhost:3000", "http://evil.com"],  # Origin
+    ["GET", "OPTIONS", "POST"],  # method
+    [None, "POST", "PATCH"],  # Access-Control-Request-Method
+    [None, "X-Foo", "content-type, authorization", "x-bar"],  # Access-Control-Request-Headers
+    [False, True],  # cookie sent
+    [False, True],  # response already carries a Vary header
+))
+
+
+def _endpoint(request):
+    response = PlainTextResponse("hi")
+    if request.query_params.get("vary"):
+        response.headers["vary"] = "Accept-Encoding"
+    return response
+
+
+def _client(middleware, config) -> TestClient:
+    app = Starlette(routes=[Route("/", _endpoint, methods=["GET", "POST", "OPTIONS"])])
+    app.add_middleware(middleware, **config)
+    return TestClient(app)
+
+
+def _normalize(response):
+    return response.status_code, response.text, sorted((k.lower(), v) for k, v in response.headers.items())
+
+
+@pytest.mark.parametrize("config", CONFIGS)
+def test_matches_starlette(config):
+    expected_client = _client(CORSMiddleware, config)
+    actual_client = _client(PureASGICORSMiddleware, config)
+
+    for origin, method, request_method, request_headers, cookie, vary in REQUESTS:
+        headers = {}
+        if origin:
+            headers["origin"] = origin
+        if request_method:
+            headers["access-control-request-method"] = request_method
+        if request_headers:
+            headers["access-control-request-headers"] = request_headers
+        if cookie:
+            headers["cookie"] = "x=1"
+        url = "/?vary=1" if vary else "/"
+
+        expected = _normalize(expected_client.request(method, url, headers=headers))
+        actual = _normalize(actual_client.request(method, url, headers=headers))
+        assert actual == expected, (origin, method, request_method, request_headers, cookie, vary)
+
+
+def test_non_http_scopes_pass_through():
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(scope["type"])
+
+    middleware = PureASGICORSMiddleware(app, allow_origins=["*"])
+
+    asyncio.run(middleware({"type": "lifespan"}, None, None))
+    assert seen == ["lifespan"]
@@ -0,0 +1,80 @@
+"""
+Tests for the shared HTTP client's retry helpers.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.core import http
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    """Route the shared client through a MockTransport replaying queued responses."""
+    queue: list = []
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        item = queue.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    async def no_backoff(attempt: int) -> None:
+        pass
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(http, "_http_client", client)
+    monkeypatch.setattr(http, "_backoff", no_backoff)
+    return queue, seen
+
+
+def test_get_retries_transient_statuses(transport):
+    queue, seen = transport
+    queue.extend([httpx.Response(503), httpx.Response(429), httpx.Response(200, text="ok")])
+
+    response = asyncio.run(http.get_with_retry("https://example.com/"))
+    assert response.status_code == 200
+    assert len(seen) == 3
+
+
+def test_get_returns_non_retryable_status_immediately(transport):
+    queue, seen = transport
+    queue.append(httpx.Response(404))
+
+    response = asyncio.run(http.get_with_retry("https://example.com/"))
+    assert response.status_code == 404
+    assert len(seen) == 1
+
+
+def test_get_returns_last_response_when_attempts_run_out(transport):
+    queue, seen = transport
+    queue.extend([httpx.Response(500), httpx.Response(502)])
+
+    response = asyncio.run(http.get_with_retry("https://example.com/", attempts=2))
+    assert response.status_code == 502
+    assert len(seen) == 2
+
+
+def test_get_reraises_final_transport_error(transport):
+    queue, _ = transport
+    queue.extend([httpx.ConnectError("down"), httpx.ConnectError("still down")])
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(http.get_with_retry("https://example.com/", attempts=2))
+
+
+def test_stream_retries_until_success(transport):
+    queue, seen = transport
+    queue.extend([httpx.ConnectError("down"), httpx.Response(503), httpx.Response(200, content=b"body")])
+
+    async def main():
+        async with http.stream_with_retry("https://example.com/") as response:
+            assert response.status_code == 200
+            return await response.aread()
+
+    assert asyncio.run(main()) == b"body"
+    assert len(seen) == 3
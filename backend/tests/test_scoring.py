@@ -0,0 +1,92 @@
+"""
+Regression tests pinning scoring results for representative snippets.
+"""
+
+import pytest
+
+from app.models.company import SourceSignal
+from app.services.scoring import analyze_sentiment, compute_scores
+
+
+def _signals(*items):
+    return [
+        SourceSignal(platform=platform, url="https://example.com", snippet=snippet, rating=rating)
+        for platform, snippet, rating in items
+    ]
+
+
+CASES = {
+    "scam reviews": (
+        "Acme Corp",
+        [
+            ("reddit", "Total scams, they scammed me", None),
+            ("reddit", "Fraudulent company, avoid", None),
+            ("glassdoor", "Worst place", 2.0),
+        ],
+        (35.0, "high", ["no_linkedin_page", "no_website_provided"], None),
+    ),
+    "course marketed as internship": (
+        "Acme Academy",
+        [
+            ("reddit", "Paid courses marketed as internships", None),
+            ("reddit", "Placements promised after trainings", None),
+            ("ambitionbox", "Great experience", 3.5),
+        ],
+        (
+            75.83333333333333,
+            "high",
+            ["no_linkedin_page", "no_glassdoor_presence", "no_website_provided", "course_marketed_as_internship"],
+            "training",
+        ),
+    ),
+    "staffing": (
+        "Acme Staffing",
+        [
+            ("linkedin", "Placements and recruitments for IT", None),
+            ("glassdoor", "Helpful and supportive, professionals", 4.2),
+            ("reddit", "legitimate, genuinely good learning", None),
+        ],
+        (87.66666666666666, "low", ["no_website_provided"], "staffing"),
+    ),
+    "edtech": (
+        "Acme",
+        [
+            ("reddit", "Upskilling platform with online learning and skills", None),
+            ("reddit", "edtech bootcamps", None),
+            ("glassdoor", "ok", 3.0),
+        ],
+        (65.0, "medium", ["no_linkedin_page", "no_website_provided"], "training"),
+    ),
+    "it services": (
+        "Acme Tech",
+        [
+            ("glassdoor", "Software development and it services", 4.0),
+            ("linkedin", "consulting", None),
+            ("reddit", "recommended", None),
+        ],
+        (78.33333333333333, "low", ["no_website_provided"], "it_services"),
+    ),
+    "no signals": (
+        "Acme",
+        [],
+        (20.0, "high", ["no external signals found", "no_linkedin_page", "no_glassdoor_presence", "no_website_provided"], None),
+    ),
+}
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_compute_scores(name):
+    company_name, items, expected = CASES[name]
+    assert compute_scores(_signals(*items), company_name) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("scams everywhere", -1.0),
+    ("they scammed me but the training was helpful", 0.0),
+    ("scam scam scams", -1.0),
+    ("a scamper through the park", 0.0),
+    ("legit and helpful, avoid the fees", 1 / 3),
+    ("nothing to see", 0.0),
+])
+def test_analyze_sentiment(text, expected):
+    assert analyze_sentiment(text) == pytest.approx(expected)